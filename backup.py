@@ -0,0 +1,181 @@
+import functools
+import gzip
+import lzma
+import os
+import sqlite3
+import time
+
+import transfer
+
+BACKUP_DIRECTORY = "backups"
+BACKUP_PAGES = 1024
+BACKUP_SLEEP = 0.005
+BACKUP_RESTARTS = 3
+# Faster levels than the defaults, which compress a database only slightly better at a fraction of the speed
+COMPRESSIONS = {
+    ".gz": functools.partial(gzip.GzipFile, compresslevel=6),
+    ".xz": functools.partial(lzma.LZMAFile, preset=1),
+}
+
+
+class Restarted(Exception):
+    pass
+
+
+def copy_pages(source, destination, pages: int = BACKUP_PAGES, sleep: float = BACKUP_SLEEP, progress=None):
+    """
+    Copies a database into another with the backup API, `pages` pages per step.
+
+    No lock that stops writers is held between steps, so waiting `sleep` seconds after
+    every step lets other connections write while a large database is copied.
+
+    A write through another connection makes the backup API start over. In WAL mode the
+    copy reads from one snapshot that is kept open until it is done, so it never restarts
+    and writers are not blocked. In the other journal modes a copy that restarted
+    BACKUP_RESTARTS times copies the remaining pages in one step, which holds a read lock
+    until it is done.
+
+    Args:
+        source (sqlite3.Connection): The database to copy.
+        destination (sqlite3.Connection): The database to overwrite.
+        pages (int): The number of pages copied per step, or -1 to copy all at once.
+        sleep (float): The seconds to wait between steps and before retrying a locked source.
+        progress (function): Called with the copied and total bytes after every step.
+    """
+    page_size = source.execute("PRAGMA page_size").fetchone()[0]
+    snapshot = source.execute("PRAGMA journal_mode").fetchone()[0].lower() == "wal"
+    state = {"remaining": None, "restarts": 0}
+
+    def step(status, remaining, total):
+        if state["remaining"] is not None and remaining > state["remaining"]:
+            state["restarts"] += 1
+            if state["restarts"] >= BACKUP_RESTARTS:
+                raise Restarted()
+        state["remaining"] = remaining
+        if progress is not None:
+            progress((total - remaining) * page_size, total * page_size)
+        if remaining and sleep:
+            time.sleep(sleep)
+
+    if snapshot:
+        source.execute("BEGIN")
+        source.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+    try:
+        source.backup(destination, pages=pages, progress=step, sleep=sleep)
+    except Restarted:
+        source.backup(destination, pages=-1, progress=step, sleep=sleep)
+    finally:
+        if snapshot:
+            source.commit()
+
+
+def copy_file(reader, writer, total: int = 0, progress=None):
+    """
+    Copies one open binary file into another in large chunks.
+
+    Args:
+        reader (file): The file to read.
+        writer (file): The file to write.
+        total (int): The number of bytes expected, or 0 if unknown.
+        progress (function): Called with the copied and total bytes after every chunk.
+    """
+    copied = 0
+    with reader, writer:
+        while True:
+            chunk = reader.read(transfer.BUFFER_SIZE)
+            if not chunk:
+                break
+            writer.write(chunk)
+            copied += len(chunk)
+            if progress is not None:
+                progress(copied, total)
+
+
+def remove(*paths):
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def backup(source, path: str, pages: int = BACKUP_PAGES, sleep: float = BACKUP_SLEEP, progress=None) -> int:
+    """
+    Writes a consistent snapshot of a live database to a file.
+
+    The snapshot is written next to `path` and renamed when it is complete, so an
+    interrupted backup never leaves a torn file behind. A .gz or .xz extension
+    compresses the snapshot after it is copied.
+
+    Args:
+        source (sqlite3.Connection): The database to back up.
+        path (str): The snapshot file.
+        pages (int): The number of pages copied per step.
+        sleep (float): The seconds to wait between steps.
+        progress (function): Called with the stage ("copy" or "compress"), the done and the total bytes.
+
+    Returns:
+        int: The size of the snapshot file in bytes.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    snapshot = path + ".part"
+    archive = path + ".tmp"
+    try:
+        remove(snapshot)
+        destination = sqlite3.connect(snapshot)
+        try:
+            copy_pages(source, destination, pages, sleep, progress and (lambda done, total: progress("copy", done, total)))
+        finally:
+            destination.close()
+
+        if transfer.split_extension(path)[1] in COMPRESSIONS:
+            compression = COMPRESSIONS[transfer.split_extension(path)[1]]
+            copy_file(open(snapshot, "rb"), compression(archive, "wb"), os.path.getsize(snapshot),
+                      progress and (lambda done, total: progress("compress", done, total)))
+            os.replace(archive, path)
+        else:
+            os.replace(snapshot, path)
+    finally:
+        remove(snapshot, archive)
+    return os.path.getsize(path)
+
+
+def restore(path: str, destination, pages: int = BACKUP_PAGES, sleep: float = BACKUP_SLEEP, progress=None):
+    """
+    Overwrites a database with a snapshot file made by `backup`.
+
+    Compressed snapshots are unpacked to a temporary file first. The snapshot is checked
+    to be a readable database before the destination is touched, and the destination is
+    replaced in one transaction, so readers see either the old or the restored database.
+
+    Args:
+        path (str): The snapshot file, optionally .gz or .xz.
+        destination (sqlite3.Connection): The database to overwrite.
+        pages (int): The number of pages copied per step.
+        sleep (float): The seconds to wait between steps.
+        progress (function): Called with the stage ("decompress" or "copy"), the done and the total bytes.
+    """
+    if not os.path.isfile(path):
+        raise ValueError(f"File {path} not found.")
+
+    compression = transfer.COMPRESSIONS.get(transfer.split_extension(path)[1])
+    snapshot = path if compression is None else path + ".part"
+    try:
+        if compression is not None:
+            # The unpacked size is not known until the end
+            copy_file(compression(path, "rb"), open(snapshot, "wb"), 0,
+                      progress and (lambda done, total: progress("decompress", done, total)))
+
+        source = sqlite3.connect(f"file:{snapshot}?mode=ro", uri=True)
+        try:
+            try:
+                source.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+            except sqlite3.DatabaseError as e:
+                raise ValueError(f"{path} is not a database snapshot: {str(e)}")
+            copy_pages(source, destination, pages, sleep, progress and (lambda done, total: progress("copy", done, total)))
+        finally:
+            source.close()
+    finally:
+        if compression is not None:
+            remove(snapshot)
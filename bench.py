@@ -0,0 +1,195 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import function
+from classes import PROFILES, Database
+
+BENCH_FILE = "bench.db"
+MAIN_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+
+
+def create_database(path: str, rows: int, tables: int):
+    """
+    Creates a synthetic database with an `items` table of `rows` rows and `tables - 1`
+    more small tables.
+
+    Args:
+        path (str): The path to the database file.
+        rows (int): The number of rows in the items table.
+        tables (int): The total number of tables.
+    """
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute("PRAGMA journal_mode = MEMORY")
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT, category TEXT, price REAL, quantity INTEGER)")
+    conn.executemany(
+        "INSERT INTO items (name, category, price, quantity) VALUES (?, ?, ?, ?)",
+        ((f"item {i}", f"category {i % 100}", (i % 1000) / 10, i % 50) for i in range(rows)),
+    )
+    for table in range(1, tables):
+        conn.execute(f"CREATE TABLE extra_{table} (id INTEGER PRIMARY KEY, value TEXT)")
+        conn.execute(f"INSERT INTO extra_{table} (value) VALUES ('value')")
+    conn.commit()
+    conn.close()
+
+
+def measure(action, repeat: int):
+    """
+    Runs an action `repeat` times with its output discarded.
+
+    Returns:
+        dict: The min, median, mean and max duration in seconds.
+    """
+    times = []
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for run in range(repeat):
+            start = time.perf_counter()
+            action(run)
+            times.append(time.perf_counter() - start)
+    return {"runs": repeat, "min": min(times), "median": statistics.median(times), "mean": statistics.mean(times), "max": max(times)}
+
+
+def benchmark_cases(db: Database, rows: int, full_scan: bool):
+    """
+    Returns the benchmarked operations by name. Every operation takes the run number,
+    so writing operations can use a different row on every run.
+
+    Reads that are kept in the result cache clear it first, so they time the query.
+    Their "(cached)" cases time the repeated read.
+    """
+    last_page = max(rows // 50, 1)
+
+    def last(db: Database):
+        return db.get_page("items", after=db.get_key_at("items", (last_page - 1) * 50 - 1) if last_page > 1 else None)
+
+    cases = {
+        "Database.get_all_tables (cold)": lambda run: (db.clear_schema_cache(), db.get_all_tables()),
+        "Database.get_all_tables (cached)": lambda run: db.get_all_tables(),
+        "Database.get_all_columns": lambda run: db.get_all_columns("items"),
+        "Database.get_page (first)": lambda run: (db.results.clear(), db.get_page("items")),
+        "Database.get_page (first, cached)": lambda run: db.get_page("items"),
+        "Database.get_page (last)": lambda run: (db.results.clear(), last(db)),
+        "Database.get_page (last, cached)": lambda run: last(db),
+        "Database.create_record": lambda run: db.create_record("items", [f"new {run}", "new", "1.0", "1"]),
+        "Database.edit_record (primary key)": lambda run: db.edit_record("items", "id", str(run + 1), str(rows + run + 1000)),
+        "Database.edit_record (no index)": lambda run: db.edit_record("items", "name", f"item {run + 100}", f"edited {run}"),
+        "Database.del_record (primary key)": lambda run: db.del_record("items", "id", str(rows // 2 + run)),
+        "Database.del_record (no index)": lambda run: db.del_record("items", "name", f"item {rows // 3 + run}"),
+        "command get tables": lambda run: function.command_get(db, "get tables"),
+        "command get columns": lambda run: function.command_get(db, "get columns items"),
+        "command sql (count)": lambda run: function.command_sql(db, "sql SELECT COUNT(*) FROM items"),
+    }
+    if full_scan:
+        cases["Database.get_all_data"] = lambda run: db.get_all_data("items")
+        cases["command get data (all pages)"] = lambda run: (db.results.clear(), function.command_get(db, "get data items"))
+    return cases
+
+
+def run(rows_list: list, tables_list: list, repeat: int, profile: str, full_scan: bool):
+    """
+    Benchmarks every combination of table size and table count in a temporary directory.
+
+    Returns:
+        list: One result per benchmarked operation and database size.
+    """
+    function.batch = True
+    results = []
+    start_dir = os.getcwd()
+    for rows in rows_list:
+        for tables in tables_list:
+            with tempfile.TemporaryDirectory() as directory:
+                os.chdir(directory)
+                try:
+                    os.mkdir("files")
+                    start = time.perf_counter()
+                    create_database(os.path.join("files", BENCH_FILE), rows, tables)
+                    print(f"Created {rows} rows in {tables} tables in {time.perf_counter() - start:.2f} s")
+
+                    db = Database(BENCH_FILE, create=False, profile=profile)
+                    for name, action in benchmark_cases(db, rows, full_scan).items():
+                        result = measure(action, repeat)
+                        results.append({"case": name, "rows": rows, "tables": tables, "profile": profile, **result})
+                        print(f"  {name:40} median {result['median'] * 1000:10.3f} ms")
+                    db.close()
+                finally:
+                    os.chdir(start_dir)
+    return results
+
+
+def run_startup(repeat: int):
+    """
+    Times starting main.py with an empty script against starting a bare interpreter.
+
+    Returns:
+        list: One result per measured command line.
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        script = os.path.join(directory, "empty.txt")
+        open(script, "w").close()
+        command_lines = {
+            "startup: python -c pass": [sys.executable, "-c", "pass"],
+            "startup: main.py --script": [sys.executable, MAIN_FILE, "--quiet", "--script", script, "--log-file", os.path.join(directory, "bench.log")],
+        }
+        for name, command_line in command_lines.items():
+            result = measure(lambda run: subprocess.run(command_line, cwd=directory, check=True, stdout=subprocess.DEVNULL), repeat)
+            results.append({"case": name, "rows": 0, "tables": 0, "profile": None, **result})
+            print(f"  {name:40} median {result['median'] * 1000:10.3f} ms")
+    return results
+
+
+def compare(results: list, path: str):
+    """
+    Prints how the median of every operation changed compared to an earlier result file.
+    """
+    with open(path, encoding="utf-8") as file:
+        old = {(result["case"], result["rows"], result["tables"]): result for result in json.load(file)["results"]}
+    print(f"\nCompared to {path}:")
+    for result in results:
+        before = old.get((result["case"], result["rows"], result["tables"]))
+        if before:
+            ratio = result["median"] / before["median"] if before["median"] else float("inf")
+            print(f"  {result['case']:40} {result['rows']:>10} rows  {ratio:6.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks SQL-Viewer database operations on synthetic databases.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000], help="row counts of the items table (default: 10000)")
+    parser.add_argument("--tables", type=int, nargs="+", default=[1], help="table counts (default: 1)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per operation (default: 5)")
+    parser.add_argument("--profile", default="safe", choices=list(PROFILES), help="connection profile (default: safe)")
+    parser.add_argument("--full-scan", action="store_true", help="also time reading the whole table")
+    parser.add_argument("--out", default="bench_results.json", help="result file (default: bench_results.json)")
+    parser.add_argument("--compare", help="earlier result file to compare against")
+    parser.add_argument("--startup-only", action="store_true", help="only time the program startup")
+    options = parser.parse_args()
+
+    results = run_startup(options.repeat)
+    if not options.startup_only:
+        results += run(options.rows, options.tables, options.repeat, options.profile, options.full_scan)
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "results": results,
+    }
+    with open(options.out, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    print(f"\nSaved results to {options.out}")
+
+    if options.compare:
+        compare(results, options.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,445 @@
+import functools
+import heapq
+import itertools
+import math
 import os
+import re
 import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+
+PAGE_SIZE = 50
+IMPORT_CHUNK_SIZE = 10000
+REBUILD_CHUNK_SIZE = 50000
+FTS_SUFFIX = "_fts"
+FTS_TOKENIZERS = ["trigram", "unicode61"]
+REGISTRY_SIZE = 8
+CATALOG_WORKERS = 8
+TABLE_STATS_WORKERS = 4
+PROGRESS_STEPS = 100000
+STATUS_DELAY = 0.5
+# Database methods that run on the worker thread, so Ctrl+C cancels only the running statement
+INTERRUPTIBLE = ["get_all_data", "query", "execute_sql", "get_page", "get_key_at", "explain", "get_values", "get_cardinality",
+                 "del_record", "edit_record", "create_index", "import_rows", "rebuild_table", "create_fts", "search", "describe"]
+STATEMENT_CACHE_SIZE = 256
+RESULT_CACHE_BYTES = 8 * 1024 * 1024
+PAGER_HISTORY = 20
+VALUES_PREVIEW = 20
+CARDINALITY_SAMPLE = 10000
+TOP_VALUES = 5
+PROFILE_COUNTERS = 64
+DISTINCT_SKETCH = 1024
+SAMPLE_BLOCKS = 100
+READ_KEYWORDS = ["SELECT", "VALUES", "EXPLAIN", "PRAGMA"]
+SCHEMA_KEYWORDS = ["CREATE", "DROP", "ALTER"]
+TRANSACTION_KEYWORDS = ["BEGIN", "COMMIT", "END", "ROLLBACK", "SAVEPOINT", "RELEASE"]
+
+# Words that end the type name in a column definition
+COLUMN_CONSTRAINTS = {"CONSTRAINT", "PRIMARY", "NOT", "NULL", "UNIQUE", "CHECK", "DEFAULT", "COLLATE", "REFERENCES", "GENERATED", "AS"}
+SQL_TOKEN = re.compile(r"""\s+|--[^\n]*|/\*.*?\*/|"(?:[^"]|"")*"|`(?:[^`]|``)*`|\[[^\]]*\]|'(?:[^']|'')*'|\w+|.""", re.S)
+
+Statement = namedtuple("Statement", ["sql", "kind", "writes"])
+# Connection settings applied when a database is opened. None leaves the setting unchanged.
+PROFILES = {
+    "safe": {"journal_mode": None, "synchronous": "FULL", "cache_size": -2000, "mmap_size": 0, "temp_store": "DEFAULT", "busy_timeout": 5000},
+    "fast-write": {"journal_mode": "WAL", "synchronous": "NORMAL", "cache_size": -65536, "mmap_size": 0, "temp_store": "MEMORY", "busy_timeout": 5000},
+    "read-heavy": {"journal_mode": "WAL", "synchronous": "NORMAL", "cache_size": -262144, "mmap_size": 1 << 30, "temp_store": "MEMORY", "busy_timeout": 5000},
+    "bulk-load": {"journal_mode": "WAL", "synchronous": "OFF", "cache_size": -262144, "mmap_size": 0, "temp_store": "MEMORY", "busy_timeout": 5000},
+}
+DEFAULT_PROFILE = "safe"
+IMPORT_PRAGMAS = {pragma: PROFILES["bulk-load"][pragma] for pragma in ["synchronous", "cache_size", "temp_store"]}
+# Latency histogram buckets grow by 2 ** (1 / 4), about 19% per bucket, starting at 1 microsecond
+HISTOGRAM_STEPS = 4
+
+
+class Stats:
+    """
+    Collects call counts, latency histograms, rows and bytes per operation.
+
+    Attributes:
+        operations (dict): The collected values by operation name.
+    """
+
+    def __init__(self):
+        self.operations = {}
+
+    def record(self, name: str, elapsed: float, rows_read: int = 0, rows_written: int = 0, bytes_returned: int = 0):
+        """
+        Records one call of an operation.
+
+        Args:
+            name (str): The name of the operation.
+            elapsed (float): The duration of the call in seconds.
+            rows_read (int): The number of rows returned.
+            rows_written (int): The number of rows changed.
+            bytes_returned (int): The approximate size of the returned values.
+        """
+        operation = self.operations.get(name)
+        if operation is None:
+            operation = self.operations[name] = {"count": 0, "total": 0.0, "max": 0.0, "rows_read": 0, "rows_written": 0, "bytes": 0, "buckets": {}}
+        operation["count"] += 1
+        operation["total"] += elapsed
+        operation["max"] = max(operation["max"], elapsed)
+        operation["rows_read"] += rows_read
+        operation["rows_written"] += rows_written
+        operation["bytes"] += bytes_returned
+        bucket = max(0, math.ceil(math.log2(max(elapsed * 1e6, 1)) * HISTOGRAM_STEPS))
+        operation["buckets"][bucket] = operation["buckets"].get(bucket, 0) + 1
+
+    def percentile(self, name: str, fraction: float) -> float:
+        """
+        Returns the latency in seconds below which the given fraction of the calls of an operation finished.
+        The value is the upper bound of the histogram bucket, so it is at most 19% too high.
+        """
+        operation = self.operations[name]
+        target = fraction * operation["count"]
+        seen = 0
+        for bucket in sorted(operation["buckets"]):
+            seen += operation["buckets"][bucket]
+            if seen >= target:
+                return min(2 ** (bucket / HISTOGRAM_STEPS) / 1e6, operation["max"])
+        return operation["max"]
+
+    def summary(self):
+        """
+        Returns the collected values of all operations, slowest total time first.
+
+        Returns:
+            list: A list of dicts with name, count, total, p50, p95, max, rows_read, rows_written and bytes.
+        """
+        result = []
+        for name, operation in self.operations.items():
+            result.append({
+                "name": name,
+                "count": operation["count"],
+                "total": operation["total"],
+                "p50": self.percentile(name, 0.5),
+                "p95": self.percentile(name, 0.95),
+                "max": operation["max"],
+                "rows_read": operation["rows_read"],
+                "rows_written": operation["rows_written"],
+                "bytes": operation["bytes"],
+            })
+        return sorted(result, key=lambda operation: operation["total"], reverse=True)
+
+    def reset(self):
+        """
+        Drops all collected values.
+        """
+        self.operations.clear()
+
+
+stats = Stats()
+
+
+def result_size(result):
+    """
+    Returns the number of rows and the approximate number of bytes in a method result.
+    Results other than lists of rows, such as cursors, count as nothing.
+    """
+    if isinstance(result, tuple) and len(result) == 2 and isinstance(result[1], list):
+        result = result[1]
+    if not isinstance(result, list):
+        return 0, 0
+    size = 0
+    for row in result:
+        if isinstance(row, tuple) and len(row) == 2 and isinstance(row[1], tuple):
+            row = row[1]
+        for value in row if isinstance(row, tuple) else (row,):
+            size += len(value) if isinstance(value, (str, bytes)) else 8
+    return len(result), size
+
+
+def measured(name: str, method):
+    """
+    Wraps a Database method so every call is recorded in stats.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        changes = self.conn.total_changes
+        start = time.perf_counter()
+        try:
+            return_value = method(self, *args, **kwargs)
+        except BaseException:
+            stats.record(name, time.perf_counter() - start)
+            raise
+        elapsed = time.perf_counter() - start
+        rows_read, bytes_returned = result_size(return_value)
+        stats.record(name, elapsed, rows_read, self.conn.total_changes - changes, bytes_returned)
+        return return_value
+    return wrapper
+
+worker = None
+
+
+def run_interruptible(conn, function, *args, **kwargs):
+    """
+    Runs a function that uses a connection on the worker thread and waits for it.
+
+    While it runs longer than STATUS_DELAY seconds, the elapsed time and the number of SQLite
+    virtual machine steps are shown on stderr. Ctrl+C calls conn.interrupt(), so only the running
+    statement is canceled. Calls made from the worker thread itself run directly.
+
+    Args:
+        conn (sqlite3.Connection): The connection the function uses. It must allow use from other threads.
+        function (callable): The function to run.
+
+    Returns:
+        The return value of the function.
+
+    Raises:
+        KeyboardInterrupt: If the statement was canceled.
+    """
+    global worker
+    if threading.current_thread() is not threading.main_thread():
+        return function(*args, **kwargs)
+    # concurrent.futures is slow to import, and most commands never need it
+    from concurrent.futures import ThreadPoolExecutor
+    from concurrent.futures import TimeoutError as WaitTimeout
+    if worker is None:
+        worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sql")
+
+    steps = [0]
+
+    def progress():
+        steps[0] += 1
+        return 0
+
+    conn.set_progress_handler(progress, PROGRESS_STEPS)
+    start = time.perf_counter()
+    future = worker.submit(function, *args, **kwargs)
+    interrupted = False
+    status = ""
+    try:
+        while True:
+            try:
+                return_value = future.result(timeout=STATUS_DELAY)
+                break
+            except WaitTimeout:
+                if sys.stderr.isatty():
+                    status = f"\rRunning... {time.perf_counter() - start:.1f} s, {steps[0] * PROGRESS_STEPS:,} steps, Ctrl+C to cancel "
+                    print(status, end="", file=sys.stderr, flush=True)
+            except KeyboardInterrupt:
+                interrupted = True
+                conn.interrupt()
+            except sqlite3.OperationalError as e:
+                if interrupted and "interrupted" in str(e):
+                    raise KeyboardInterrupt from e
+                raise
+    finally:
+        conn.set_progress_handler(None, 0)
+        if status:
+            print("\r" + " " * len(status) + "\r", end="", file=sys.stderr, flush=True)
+    return return_value
+
+
+def interruptible(method):
+    """
+    Wraps a Database method so it runs with run_interruptible. If canceling a statement
+    rolled back the open transaction, the transaction state is reset.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return run_interruptible(self.conn, method, self, *args, **kwargs)
+        finally:
+            if self.session and not self.conn.in_transaction:
+                self.session = False
+                self.savepoints.clear()
+                self.clear_schema_cache()
+                print("\nThe open transaction was rolled back.")
+    return wrapper
+
+class ColumnProfile:
+    """
+    SQLite aggregate function that finds the most frequent values and estimates the number
+    of distinct values of a column in one pass with bounded memory.
+
+    The frequent values are counted with the Misra-Gries algorithm in PROFILE_COUNTERS
+    counters, the distinct values with a k-minimum-values sketch of DISTINCT_SKETCH hashes.
+    The sketch also counts how often each of its values occurs, which estimates how many
+    values occur only once. NULLs are skipped.
+    """
+
+    def __init__(self):
+        self.counters = {}
+        self.decremented = False
+        self.hashes = []
+        self.seen = {}
+
+    def step(self, value):
+        if value is None:
+            return
+        counters = self.counters
+        if value in counters:
+            counters[value] += 1
+        elif len(counters) < PROFILE_COUNTERS:
+            counters[value] = 1
+        else:
+            # No free counter: every count goes down by one and counters at zero are freed
+            self.decremented = True
+            self.counters = {key: count - 1 for key, count in counters.items() if count > 1}
+
+        # hash() of a tuple mixes the bits, so the sketch also works for small integers
+        digest = hash((value,)) & 0xFFFFFFFFFFFFFFFF
+        if digest in self.seen:
+            self.seen[digest] += 1
+        elif len(self.hashes) < DISTINCT_SKETCH:
+            heapq.heappush(self.hashes, -digest)
+            self.seen[digest] = 1
+        elif digest < -self.hashes[0]:
+            del self.seen[-heapq.heappushpop(self.hashes, -digest)]
+            self.seen[digest] = 1
+
+    def finalize(self):
+        import json
+        # A value in the final sketch was kept from its first occurrence on, so its count is exact
+        once = sum(1 for count in self.seen.values() if count == 1)
+        if len(self.hashes) < DISTINCT_SKETCH:
+            distinct, exact = len(self.hashes), True
+        else:
+            distinct, exact = round((DISTINCT_SKETCH - 1) * 2 ** 64 / -self.hashes[0]), False
+            once = round(distinct * once / len(self.seen))
+        top = sorted(self.counters.items(), key=lambda item: item[1], reverse=True)[:TOP_VALUES]
+        return json.dumps({"distinct": distinct, "exact": exact, "once": once, "counted": not self.decremented,
+                           "top": [[value if isinstance(value, (int, float)) else str(value), count] for value, count in top]})
+
+
+def estimate_distinct(rows: int, seen: int, distinct: int, once: int) -> int:
+    """
+    Scales the number of distinct values found in a sample to the whole table with the GEE estimator.
+
+    Args:
+        rows (int): The number of values in the table.
+        seen (int): The number of values in the sample.
+        distinct (int): The number of distinct values in the sample.
+        once (int): The number of values that occur only once in the sample.
+
+    Returns:
+        int: The estimated number of distinct values in the table.
+    """
+    if once == distinct:
+        # No repeats in the sample, the column is most likely unique
+        return rows
+    return min(round(math.sqrt(max(rows, seen) / seen) * once + distinct - once), rows)
+
+
+def read_table_stats(path: str, table: str, indexes: list, connections: set):
+    """
+    Reads the row count and on-disk size of a table and its indexes through a read-only connection.
+
+    Args:
+        path (str): The path to the database file.
+        table (str): The name of the table.
+        indexes (list): The names of the indexes of the table.
+        connections (set): The open connections, so they can be interrupted on cancel.
+
+    Returns:
+        dict: The row count, table size and index size in bytes. The sizes are None
+        if SQLite is built without the dbstat table.
+    """
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+    connections.add(conn)
+    try:
+        rows = conn.execute(f"SELECT COUNT(*) FROM {quote(table)}").fetchone()[0]
+        try:
+            size_sql = "SELECT COALESCE(SUM(pgsize), 0) FROM dbstat WHERE name = ? AND aggregate = TRUE"
+            size = conn.execute(size_sql, (table,)).fetchone()[0]
+            index_size = sum(conn.execute(size_sql, (index,)).fetchone()[0] for index in indexes)
+        except sqlite3.OperationalError as e:
+            if "dbstat" not in str(e) and "aggregate" not in str(e):
+                raise
+            size = index_size = None
+    finally:
+        connections.discard(conn)
+        conn.close()
+    return {"table": table, "rows": rows, "size": size, "indexes": len(indexes), "index_size": index_size}
+
+
+def split_definitions(sql: str):
+    """
+    Splits a CREATE TABLE statement into the part before the column list, the column
+    and constraint definitions, and the part after the column list.
+
+    Returns:
+        tuple: The head up to the opening parenthesis, a list of definitions and the tail
+        from the closing parenthesis.
+    """
+    depth = 0
+    head = None
+    definitions = []
+    start = None
+    for token in SQL_TOKEN.finditer(sql):
+        text = token.group()
+        if text == "(":
+            depth += 1
+            if depth == 1:
+                head = sql[:token.end()]
+                start = token.end()
+        elif text == ")":
+            depth -= 1
+            if depth == 0:
+                definitions.append(sql[start:token.start()].strip())
+                return head, definitions, sql[token.start():]
+        elif text == "," and depth == 1:
+            definitions.append(sql[start:token.start()].strip())
+            start = token.end()
+    raise ValueError("Can't parse the table definition.")
+
+
+def unquote(name: str) -> str:
+    """
+    Removes the quotes around an SQL identifier.
+    """
+    if name[:1] in ['"', '`', "'"]:
+        return name[1:-1].replace(name[0] * 2, name[0])
+    if name[:1] == "[":
+        return name[1:-1]
+    return name
+
+
+def quote(name: str, mark: str = '"') -> str:
+    """
+    Quotes an SQL identifier, or a string literal with mark="'". Quotes inside the name are doubled.
+    """
+    return mark + name.replace(mark, mark * 2) + mark
+
+
+def definition_column(definition: str):
+    """
+    Returns the column name of a column definition, or None for a table constraint.
+    """
+    tokens = [token.group() for token in SQL_TOKEN.finditer(definition) if not token.group().isspace() and token.group()[:2] not in ["--", "/*"]]
+    if not tokens or tokens[0].upper() in ["CONSTRAINT", "PRIMARY", "UNIQUE", "CHECK", "FOREIGN"]:
+        return None
+    return unquote(tokens[0])
+
+
+def references(sql: str, name: str) -> bool:
+    """
+    Checks if an SQL statement mentions a table name, quoted or not, outside of strings and comments.
+    """
+    name = name.lower()
+    return any(token.group()[:1] != "'" and unquote(token.group()).lower() == name for token in SQL_TOKEN.finditer(sql))
+
+
+def replace_type(definition: str, new_type: str) -> str:
+    """
+    Replaces the type name in a column definition and keeps its constraints.
+    """
+    tokens = [token for token in SQL_TOKEN.finditer(definition) if not token.group().isspace() and token.group()[:2] not in ["--", "/*"]]
+    name = tokens[0]
+    end = name.end()
+    depth = 0
+    for token in tokens[1:]:
+        if depth == 0 and token.group().upper() in COLUMN_CONSTRAINTS:
+            break
+        depth += {"(": 1, ")": -1}.get(token.group(), 0)
+        end = token.end()
+    return f"{definition[:name.end()]} {new_type}{definition[end:]}"
 
 
 class Database:
@@ -8,25 +448,45 @@ class Database:
 
     Attributes:
         nameDB (str): The name of the database file.
+        path (str): The absolute path of the database file.
+        profile (str): The name of the performance profile from PROFILES applied to the connection.
         conn (sqlite3.Connection): The database connection object.
         cur (sqlite3.Cursor): The cursor object for executing SQL queries.
+        statements (StatementCache): The parsed SQL statements typed by the user.
+        results (ResultCache): The results of read methods, kept until the database changes.
+        session (bool): True while a transaction started with begin() is open.
+        savepoints (list): The names of the open savepoints, innermost last.
+
+    Table and column lists are cached and reused until PRAGMA schema_version changes,
+    so a schema change made by another connection is noticed on the next lookup.
     """
 
-    def __init__(self, nameDB: str):
+    def __init__(self, nameDB: str, create: bool = None, profile: str = DEFAULT_PROFILE):
         """
         Initializes a new instance of the Database class.
 
         Args:
             nameDB (str): The name of the database file.
+            create (bool): Whether to create a missing database file. Asks the user if not set.
+            profile (str): The name of the performance profile from PROFILES.
         """
+        self.schema_version = None
+        self.schema_cache = {}
+        self.statements = StatementCache()
+        self.results = ResultCache()
+        self.session = False
+        self.savepoints = []
+
         if not os.path.exists("files/"+nameDB):
-            fail = input("Database not found. Create a new database? (y/n): ")
+            if create is False:
+                raise ValueError(f"Database {nameDB} not found.")
+            fail = "y" if create else input("Database not found. Create a new database? (y/n): ")
             if fail in ["y", "Y", "yes", "Yes"]:
                 self.nameDB = nameDB
                 if ".db" not in self.nameDB:
-                    self.conn = sqlite3.connect("files/"+self.nameDB+".db")
+                    self.conn = sqlite3.connect("files/"+self.nameDB+".db", cached_statements=STATEMENT_CACHE_SIZE, check_same_thread=False)
                 else:
-                    self.conn = sqlite3.connect("files/"+self.nameDB)
+                    self.conn = sqlite3.connect("files/"+self.nameDB, cached_statements=STATEMENT_CACHE_SIZE, check_same_thread=False)
                 self.cur = self.conn.cursor()
 
             elif fail in ["n", "N", "no", "No"]:
@@ -39,9 +499,296 @@ class Database:
 
         else:
             self.nameDB = nameDB
-            self.conn = sqlite3.connect("files/"+self.nameDB)
+            self.conn = sqlite3.connect("files/"+self.nameDB, cached_statements=STATEMENT_CACHE_SIZE, check_same_thread=False)
             self.cur = self.conn.cursor()
 
+        self.path = os.path.realpath(self.conn.execute("PRAGMA database_list").fetchone()[2])
+        self.profile = None
+        self.set_profile(profile)
+
+    def set_profile(self, profile: str):
+        """
+        Applies a performance profile to the connection.
+
+        Args:
+            profile (str): The name of the profile from PROFILES.
+        """
+        if profile not in PROFILES:
+            raise ValueError(f"Profile {profile} not found. Available profiles: {', '.join(PROFILES)}")
+        if self.session:
+            raise ValueError("Can't change the profile inside a transaction.")
+        if self.conn.in_transaction:
+            self.conn.commit()
+        for pragma, value in PROFILES[profile].items():
+            if value is not None:
+                self.conn.execute(f"PRAGMA {pragma} = {value}").fetchall()
+        self.profile = profile
+
+    def get_pragmas(self):
+        """
+        Returns the current values of the settings a profile controls.
+
+        Returns:
+            dict: The value of every pragma by name.
+        """
+        return {pragma: self.conn.execute(f"PRAGMA {pragma}").fetchone()[0] for pragma in PROFILES[DEFAULT_PROFILE]}
+
+    def close(self):
+        """
+        Closes the database connection. An open transaction is rolled back.
+        """
+        self.session = False
+        self.savepoints.clear()
+        self.conn.close()
+
+    def attach(self, nameDB: str, alias: str):
+        """
+        Attaches another database file from files/ to this connection, so its tables
+        can be used in the same query as alias.table.
+
+        Args:
+            nameDB (str): The name of the database file.
+            alias (str): The schema name of the attached database.
+        """
+        try:
+            if ".db" not in nameDB:
+                nameDB += ".db"
+            if not os.path.exists("files/"+nameDB):
+                raise ValueError(f"Database {nameDB} not found.")
+            if self.session:
+                raise ValueError("Can't attach a database inside a transaction.")
+            if self.conn.in_transaction:
+                self.conn.commit()
+            self.cur.execute("ATTACH DATABASE ? AS ?", ("files/"+nameDB, alias))
+            self.results.clear()
+        except Exception as e:
+            print(f"Error | Method - attach: {str(e)}")
+        else:
+            print(f"Successful! Attached Database: {nameDB} as {alias}")
+
+    def detach(self, alias: str):
+        """
+        Detaches an attached database.
+
+        Args:
+            alias (str): The schema name of the attached database.
+        """
+        try:
+            if self.session:
+                raise ValueError("Can't detach a database inside a transaction.")
+            if self.conn.in_transaction:
+                self.conn.commit()
+            self.cur.execute("DETACH DATABASE ?", (alias,))
+            self.results.clear()
+        except Exception as e:
+            print(f"Error | Method - detach: {str(e)}")
+        else:
+            print(f"Successful! Detached: {alias}")
+
+    def backup(self, path: str, pages: int = None, sleep: float = None, progress=None) -> int:
+        """
+        Writes a snapshot of the database to a file while it stays usable, see backup.backup.
+
+        Args:
+            path (str): The snapshot file, compressed if it ends with .gz or .xz.
+            pages (int): The number of pages copied per step, backup.BACKUP_PAGES by default.
+            sleep (float): The seconds to wait between steps so other connections can write, backup.BACKUP_SLEEP by default.
+            progress (function): Called with the stage, the done and the total bytes.
+
+        Returns:
+            int: The size of the snapshot file in bytes.
+        """
+        if self.session:
+            raise ValueError("Can't back up a database inside a transaction.")
+        if self.conn.in_transaction:
+            self.conn.commit()
+        import backup
+        return backup.backup(self.conn, path, backup.BACKUP_PAGES if pages is None else pages,
+                             backup.BACKUP_SLEEP if sleep is None else sleep, progress)
+
+    def restore(self, path: str, pages: int = None, sleep: float = None, progress=None):
+        """
+        Replaces the content of the database with a snapshot file, see backup.restore.
+
+        Args:
+            path (str): The snapshot file, optionally .gz or .xz.
+            pages (int): The number of pages copied per step, backup.BACKUP_PAGES by default.
+            sleep (float): The seconds to wait between steps, backup.BACKUP_SLEEP by default.
+            progress (function): Called with the stage, the done and the total bytes.
+        """
+        if self.session:
+            raise ValueError("Can't restore a database inside a transaction.")
+        if self.conn.in_transaction:
+            self.conn.commit()
+        import backup
+        try:
+            backup.restore(path, self.conn, backup.BACKUP_PAGES if pages is None else pages,
+                           backup.BACKUP_SLEEP if sleep is None else sleep, progress)
+        finally:
+            self.clear_schema_cache()
+
+    def get_attached(self):
+        """
+        Returns the databases attached to this connection.
+
+        Returns:
+            list: A list of tuples containing the schema name and the file of every attached database.
+        """
+        self.cur.execute("PRAGMA database_list")
+        return [(name, file) for _, name, file in self.cur.fetchall() if name not in ["main", "temp"]]
+
+    def check_schema(self):
+        """
+        Drops the cached schema if the database schema has changed since it was read.
+        """
+        self.cur.execute("PRAGMA schema_version")
+        version = self.cur.fetchone()[0]
+        if version != self.schema_version:
+            self.schema_cache.clear()
+            self.schema_version = version
+
+    def clear_schema_cache(self):
+        """
+        Drops the cached schema and results. Called after every schema change made through
+        this object and after a rollback, which undoes changes without changing the data version.
+        """
+        self.schema_cache.clear()
+        self.schema_version = None
+        self.results.clear()
+
+    def _version(self):
+        """
+        Returns a value that changes whenever the data or schema of the database changes.
+
+        PRAGMA data_version changes when another connection commits, total_changes when this
+        connection writes and PRAGMA schema_version with every schema change.
+
+        Returns:
+            tuple: The data version, schema version and total changes.
+        """
+        data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        schema_version = self.conn.execute("PRAGMA schema_version").fetchone()[0]
+        return data_version, schema_version, self.conn.total_changes
+
+    def _cached(self, key: tuple, compute):
+        """
+        Returns the cached result for a key, or computes and caches it if the database
+        changed since it was stored.
+        """
+        self.results.check(self._version())
+        found, value = self.results.get(key)
+        if not found:
+            value = compute()
+            self.results.put(key, value)
+        return value
+
+    def autocommit(self):
+        """
+        Commits the last change, unless a transaction was started with begin().
+        """
+        if not self.session:
+            self.conn.commit()
+
+    def begin(self):
+        """
+        Starts a transaction. Changes are kept until commit() or rollback() is called,
+        so a run of edits is written to disk once.
+        """
+        try:
+            if self.session:
+                raise ValueError("Transaction is already open.")
+            if self.conn.in_transaction:
+                self.conn.commit()
+            self.cur.execute("BEGIN")
+            self.session = True
+        except Exception as e:
+            print(f"Error | Method - begin: {str(e)}")
+        else:
+            print(f"Transaction started in Database: {self.nameDB}")
+
+    def commit(self):
+        """
+        Commits the open transaction.
+        """
+        try:
+            if not self.session:
+                raise ValueError("No open transaction.")
+            self.conn.commit()
+            self.session = False
+            self.savepoints.clear()
+        except Exception as e:
+            print(f"Error | Method - commit: {str(e)}")
+        else:
+            print("Committed!")
+
+    def rollback(self):
+        """
+        Rolls back the open transaction.
+        """
+        try:
+            if not self.session:
+                raise ValueError("No open transaction.")
+            self.conn.rollback()
+            self.session = False
+            self.savepoints.clear()
+            self.clear_schema_cache()
+        except Exception as e:
+            print(f"Error | Method - rollback: {str(e)}")
+        else:
+            print("Rolled back!")
+
+    def savepoint(self, name: str):
+        """
+        Creates a savepoint inside the open transaction. Starts a transaction if none is open.
+
+        Args:
+            name (str): The name of the savepoint.
+        """
+        try:
+            if not self.session:
+                self.begin()
+            self.cur.execute(f"SAVEPOINT {name}")
+            self.savepoints.append(name)
+        except Exception as e:
+            print(f"Error | Method - savepoint: {str(e)}")
+        else:
+            print(f"Savepoint created: {name}")
+
+    def release(self, name: str):
+        """
+        Releases a savepoint, keeping its changes in the open transaction.
+
+        Args:
+            name (str): The name of the savepoint.
+        """
+        try:
+            if name not in self.savepoints:
+                raise ValueError(f"Savepoint {name} not found.")
+            self.cur.execute(f"RELEASE SAVEPOINT {name}")
+            del self.savepoints[self.savepoints.index(name):]
+        except Exception as e:
+            print(f"Error | Method - release: {str(e)}")
+        else:
+            print(f"Savepoint released: {name}")
+
+    def rollback_to(self, name: str):
+        """
+        Undoes the changes made after a savepoint. The savepoint stays open.
+
+        Args:
+            name (str): The name of the savepoint.
+        """
+        try:
+            if name not in self.savepoints:
+                raise ValueError(f"Savepoint {name} not found.")
+            self.cur.execute(f"ROLLBACK TO SAVEPOINT {name}")
+            del self.savepoints[self.savepoints.index(name) + 1:]
+            self.clear_schema_cache()
+        except Exception as e:
+            print(f"Error | Method - rollback_to: {str(e)}")
+        else:
+            print(f"Rolled back to savepoint: {name}")
+
     def get_all_tables(self):
         """
         Returns all tables in the database.
@@ -49,8 +796,11 @@ class Database:
         Returns:
             list: A list of tuples containing the names of all tables in the database.
         """
-        self.cur.execute("SELECT name FROM sqlite_master WHERE type='table';")
-        return self.cur.fetchall()
+        self.check_schema()
+        if "tables" not in self.schema_cache:
+            self.cur.execute("SELECT name FROM sqlite_master WHERE type='table';")
+            self.schema_cache["tables"] = self.cur.fetchall()
+        return list(self.schema_cache["tables"])
 
     def get_all_columns(self, table: str):
         """
@@ -63,60 +813,617 @@ class Database:
             list: A list of tuples containing the names and types of all columns in the table.
         """
         try:
-            self.cur.execute(f"PRAGMA table_info({table})")
-            return self.cur.fetchall()
+            self.check_schema()
+            if ("columns", table) not in self.schema_cache:
+                self.cur.execute(f"PRAGMA table_info({quote(table)})")
+                self.schema_cache[("columns", table)] = self.cur.fetchall()
+            return list(self.schema_cache[("columns", table)])
 
         except Exception as e:
             return print(f"Error | Method - get_all_columns: {str(e)}")
 
-    def get_all_data(self, table: str):
+    def get_all_data(self, table: str):
+        """
+        Returns all data in a table.
+
+        Args:
+            table (str): The name of the table.
+
+        Returns:
+            list: A list of tuples containing all data in the table.
+        """
+        self.cur.execute(f"SELECT * FROM {table}")
+        return self.cur.fetchall()
+
+    def query(self, sql: str, params: tuple = ()):
+        """
+        Executes a query on a separate cursor so its rows can be read incrementally.
+
+        Args:
+            sql (str): The SQL query.
+            params (tuple): The query parameters.
+
+        Returns:
+            sqlite3.Cursor: The executed cursor.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(sql, params)
+        return cursor
+
+    def execute_sql(self, sql: str, params: tuple = ()):
+        """
+        Executes an SQL statement typed by the user.
+
+        The statement is prepared through the connection's statement cache, so running
+        the same text again skips the SQL compiler. Changes are committed unless a
+        transaction was started with begin().
+
+        Args:
+            sql (str): The SQL statement.
+            params (tuple): The statement parameters.
+
+        Returns:
+            tuple: The executed cursor and the parsed Statement.
+        """
+        statement = self.statements.get(sql)
+        if statement.kind in TRANSACTION_KEYWORDS:
+            raise ValueError("Use the begin, commit, rollback and savepoint commands to control transactions.")
+
+        cursor = self.conn.cursor()
+        cursor.execute(statement.sql, params)
+        if statement.writes:
+            if statement.kind in SCHEMA_KEYWORDS:
+                self.clear_schema_cache()
+            self.autocommit()
+        return cursor, statement
+
+    def get_key_columns(self, table: str):
+        """
+        Returns the columns used to page through a table.
+
+        Tables with a rowid are paged on the rowid, WITHOUT ROWID tables on their primary key.
+
+        Args:
+            table (str): The name of the table.
+
+        Returns:
+            list: A list with the names of the key columns.
+        """
+        self.check_schema()
+        if ("keys", table) not in self.schema_cache:
+            try:
+                self.cur.execute(f"SELECT rowid FROM {quote(table)} LIMIT 0")
+            except sqlite3.OperationalError:
+                primary_key = sorted((column for column in self.get_all_columns(table) if column[5]), key=lambda column: column[5])
+                self.schema_cache[("keys", table)] = [column[1] for column in primary_key]
+            else:
+                self.schema_cache[("keys", table)] = ["rowid"]
+        return list(self.schema_cache[("keys", table)])
+
+    def get_page(self, table: str, size: int = PAGE_SIZE, after: tuple = None, before: tuple = None):
+        """
+        Returns one page of a table using keyset pagination.
+
+        Only the rows of the requested page are read, so the cost does not depend on the table size.
+
+        Args:
+            table (str): The name of the table.
+            size (int): The maximum number of rows in the page.
+            after (tuple): Key of the row after which the page starts.
+            before (tuple): Key of the row before which the page ends.
+
+        Returns:
+            tuple: The column names and a list of (key, row) tuples ordered by key.
+        """
+        return self._cached(("page", table, size, after, before), lambda: self._get_page(table, size, after, before))
+
+    def _get_page(self, table: str, size: int, after: tuple, before: tuple):
+        keys = self.get_key_columns(table)
+        key = ", ".join(keys)
+        placeholders = ", ".join("?" for _ in keys)
+        sql = f"SELECT {key}, * FROM {table}"
+        params = []
+        order = "ASC"
+        if after is not None:
+            sql += f" WHERE ({key}) > ({placeholders})"
+            params.extend(after)
+        elif before is not None:
+            sql += f" WHERE ({key}) < ({placeholders})"
+            params.extend(before)
+            order = "DESC"
+        sql += " ORDER BY " + ", ".join(f"{k} {order}" for k in keys) + " LIMIT ?"
+        params.append(size)
+
+        self.cur.execute(sql, params)
+        headers = [description[0] for description in self.cur.description][len(keys):]
+        rows = [(row[:len(keys)], row[len(keys):]) for row in self.cur.fetchmany(size)]
+        if order == "DESC":
+            rows.reverse()
+        return headers, rows
+
+    def get_key_at(self, table: str, offset: int):
+        """
+        Returns the key of the row at the given position of a table.
+
+        Args:
+            table (str): The name of the table.
+            offset (int): The zero-based position of the row in key order.
+
+        Returns:
+            tuple: The key of the row, or None if the table has fewer rows.
+        """
+        def compute():
+            keys = self.get_key_columns(table)
+            self.cur.execute(f"SELECT {', '.join(keys)} FROM {table} ORDER BY {', '.join(keys)} LIMIT 1 OFFSET ?", (offset,))
+            return self.cur.fetchone()
+        return self._cached(("key_at", table, offset), compute)
+
+    def del_table(self, table: str):
+        """
+        Deletes a table from the database.
+
+        Args:
+            table (str): The name of the table to be deleted.
+        """
+        try:
+            if table in [index[0] for index in self.get_fts()]:
+                self.cur.execute(f"DROP TABLE {quote(table + FTS_SUFFIX)}")
+            self.cur.execute(f"DROP TABLE {table}")
+            self.clear_schema_cache()
+            self.autocommit()
+
+        except Exception as e:
+            return print(f"Error | Method - del_table: {str(e)}")
+        
+        else:
+            return print("Successful!")
+        
+    def del_column(self, column: str, table: str):
+        """
+        Deletes a column from a table.
+
+        Args:
+            column (str): The name of the column to be deleted.
+            table (str): The name of the table from which the column is to be deleted.
+        """
+        try:
+            # DROP COLUMN was added in SQLite 3.35, older versions rebuild the table
+            if sqlite3.sqlite_version_info >= (3, 35, 0):
+                self.cur.execute(f"ALTER TABLE {table} DROP COLUMN {column}")
+            else:
+                self.rebuild_table(table, drop=[column])
+            self.clear_schema_cache()
+            self.autocommit()
+
+        except Exception as e:
+            return print(f"Error | Method - del_column: {str(e)}")
+        
+        else:
+            return print("Successful!")
+        
+    def get_indexes(self, table: str = None):
+        """
+        Returns the indexes in the database.
+
+        Args:
+            table (str): Only return the indexes of this table.
+
+        Returns:
+            list: A list of tuples containing the name, table, columns and uniqueness of every index.
+        """
+        self.check_schema()
+        if "indexes" not in self.schema_cache:
+            self.cur.execute("SELECT name, tbl_name FROM sqlite_master WHERE type='index' ORDER BY tbl_name, name")
+            indexes = []
+            for name, tbl_name in self.cur.fetchall():
+                self.cur.execute(f"PRAGMA index_info({quote(name)})")
+                columns = ", ".join(str(column[2]) for column in self.cur.fetchall())
+                self.cur.execute(f"PRAGMA index_list({quote(tbl_name)})")
+                unique = any(index[1] == name and index[2] for index in self.cur.fetchall())
+                indexes.append((name, tbl_name, columns, unique))
+            self.schema_cache["indexes"] = indexes
+        return [index for index in self.schema_cache["indexes"] if table is None or index[1] == table]
+
+    def get_table_stats(self, workers: int = TABLE_STATS_WORKERS, progress=None):
+        """
+        Returns the row count, size and index count of every table. The tables are counted in
+        parallel on separate read-only connections, so uncommitted changes of this connection
+        are not included.
+
+        Args:
+            workers (int): The number of tables counted at the same time.
+            progress (callable): Called with the number of finished tables and the total.
+
+        Returns:
+            list: A list of dicts with table, rows, size, indexes, index_size and avg_row_size,
+            in the order of get_all_tables().
+
+        Raises:
+            KeyboardInterrupt: If canceled. The running queries are interrupted first.
+        """
+        self.results.check(self._version())
+        found, value = self.results.get(("table_stats",))
+        if found:
+            return value
+
+        tables = [table[0] for table in self.get_all_tables()]
+        indexes = {table: [index[0] for index in self.get_indexes(table)] for table in tables}
+        connections = set()
+        results = {}
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            futures = [executor.submit(read_table_stats, self.path, table, indexes[table], connections) for table in tables]
+            for done, future in enumerate(as_completed(futures), 1):
+                result = future.result()
+                result["avg_row_size"] = result["size"] / result["rows"] if result["size"] is not None and result["rows"] else None
+                results[result["table"]] = result
+                if progress:
+                    progress(done, len(tables))
+        except BaseException:
+            for conn in list(connections):
+                conn.interrupt()
+            raise
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+        table_stats = [results[table] for table in tables]
+        self.results.put(("table_stats",), table_stats)
+        return table_stats
+
+    def create_index(self, table: str, columns: list, name: str = None, unique: bool = False):
+        """
+        Creates an index on columns of a table.
+
+        Args:
+            table (str): The name of the table.
+            columns (list): The names of the indexed columns.
+            name (str): The name of the index. Defaults to idx_<table>_<columns>.
+            unique (bool): Whether the index is unique.
+        """
+        try:
+            if not columns:
+                raise ValueError("No columns provided.")
+            name = name or f"idx_{table}_{'_'.join(columns)}"
+            self.cur.execute(f"CREATE {'UNIQUE ' if unique else ''}INDEX {name} ON {table} ({', '.join(columns)})")
+            self.clear_schema_cache()
+            self.autocommit()
+        except Exception as e:
+            print(f"Error | Method - create_index: {str(e)}")
+        else:
+            print(f"Successful! Created index: {name} on {table} ({', '.join(columns)})")
+
+    def del_index(self, name: str):
+        """
+        Deletes an index.
+
+        Args:
+            name (str): The name of the index.
+        """
+        try:
+            self.cur.execute(f"DROP INDEX {name}")
+            self.clear_schema_cache()
+            self.autocommit()
+        except Exception as e:
+            print(f"Error | Method - del_index: {str(e)}")
+        else:
+            print(f"Successful! Deleted index: {name}")
+
+    def get_fts(self):
+        """
+        Returns the full-text indexes created with create_fts.
+
+        Returns:
+            list: A list of tuples containing the table name and the indexed column names.
+        """
+        self.check_schema()
+        if "fts" not in self.schema_cache:
+            self.cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name LIKE '%' || ? AND sql LIKE 'CREATE VIRTUAL TABLE%fts5%'", (FTS_SUFFIX,))
+            indexes = []
+            for name, in self.cur.fetchall():
+                columns = [column[1] for column in self.conn.execute(f"PRAGMA table_info({quote(name)})")]
+                indexes.append((name[:-len(FTS_SUFFIX)], columns))
+            self.schema_cache["fts"] = indexes
+        return list(self.schema_cache["fts"])
+
+    def create_fts(self, table: str, columns: list, tokenizer: str = "trigram", chunk_size: int = REBUILD_CHUNK_SIZE, progress=None):
+        """
+        Creates a full-text index over TEXT columns of a table.
+
+        The index is an FTS5 table that reads the text from the table itself, so the text is
+        not stored twice. Triggers keep it in sync with inserts, updates and deletes. The
+        existing rows are indexed in batches of `chunk_size` rows inside one savepoint.
+
+        Args:
+            table (str): The name of the table. It must have a rowid.
+            columns (list): The names of the indexed columns.
+            tokenizer (str): "trigram" to match any part of a word, at least 3 characters,
+                or "unicode61" to match whole words.
+            chunk_size (int): The number of rows indexed per statement.
+            progress (callable): Called with the number of indexed rows after every batch.
+
+        Returns:
+            int: The number of indexed rows.
+        """
+        if not columns:
+            raise ValueError("No columns provided.")
+        if tokenizer not in FTS_TOKENIZERS:
+            raise ValueError(f"Tokenizer {tokenizer} not found. Available tokenizers: {', '.join(FTS_TOKENIZERS)}")
+        if self.get_key_columns(table) != ["rowid"]:
+            raise ValueError("Full-text indexes need a table with a rowid.")
+        existing = [column[1] for column in self.get_all_columns(table)]
+        for column in columns:
+            if column not in existing:
+                raise ValueError(f"Column {column} not found in table {table}.")
+
+        self.cur.execute("SAVEPOINT create_fts")
+        try:
+            count = self._build_fts(table, columns, tokenizer, chunk_size, progress)
+        except BaseException:
+            if self.conn.in_transaction:
+                self.cur.execute("ROLLBACK TO SAVEPOINT create_fts")
+                self.cur.execute("RELEASE SAVEPOINT create_fts")
+            raise
+        else:
+            self.cur.execute("RELEASE SAVEPOINT create_fts")
+        finally:
+            self.clear_schema_cache()
+        self.autocommit()
+        return count
+
+    def _build_fts(self, table: str, columns: list, tokenizer: str, chunk_size: int = REBUILD_CHUNK_SIZE, progress=None):
+        """
+        Creates the FTS5 table and the triggers of a full-text index and indexes the existing rows.
+        The caller holds the savepoint.
+
+        Returns:
+            int: The number of indexed rows.
+        """
+        fts = quote(table + FTS_SUFFIX)
+        name = quote(table)
+        names = ", ".join(quote(column) for column in columns)
+        new = ", ".join(f"new.{quote(column)}" for column in columns)
+        old = ", ".join(f"old.{quote(column)}" for column in columns)
+        self.cur.execute(f"CREATE VIRTUAL TABLE {fts} USING fts5({names}, content={quote(table, chr(39))}, content_rowid='rowid', tokenize='{tokenizer}')")
+        self.cur.execute(f"CREATE TRIGGER {quote(table + FTS_SUFFIX + '_insert')} AFTER INSERT ON {name} BEGIN "
+                         f"INSERT INTO {fts} (rowid, {names}) VALUES (new.rowid, {new}); END")
+        self.cur.execute(f"CREATE TRIGGER {quote(table + FTS_SUFFIX + '_delete')} AFTER DELETE ON {name} BEGIN "
+                         f"INSERT INTO {fts} ({fts}, rowid, {names}) VALUES ('delete', old.rowid, {old}); END")
+        self.cur.execute(f"CREATE TRIGGER {quote(table + FTS_SUFFIX + '_update')} AFTER UPDATE ON {name} BEGIN "
+                         f"INSERT INTO {fts} ({fts}, rowid, {names}) VALUES ('delete', old.rowid, {old}); "
+                         f"INSERT INTO {fts} (rowid, {names}) VALUES (new.rowid, {new}); END")
+        return self._copy_batches(table, f"INSERT INTO {fts} (rowid, {names}) SELECT rowid, {names} FROM {name}", chunk_size, progress)
+
+    def del_fts(self, table: str):
+        """
+        Deletes the full-text index of a table and its triggers.
+
+        Args:
+            table (str): The name of the table.
+        """
+        try:
+            if table not in [index[0] for index in self.get_fts()]:
+                raise ValueError(f"Table {table} has no full-text index.")
+            self._drop_fts(table)
+            self.clear_schema_cache()
+            self.autocommit()
+        except Exception as e:
+            print(f"Error | Method - del_fts: {str(e)}")
+        else:
+            print(f"Successful! Deleted full-text index of table: {table}")
+
+    def _drop_fts(self, table: str):
+        """
+        Drops the FTS5 table and the triggers of the full-text index of a table.
+        """
+        fts = table + FTS_SUFFIX
+        for action in ["insert", "delete", "update"]:
+            self.cur.execute(f"DROP TRIGGER IF EXISTS {quote(f'{fts}_{action}')}")
+        self.cur.execute(f"DROP TABLE {quote(fts)}")
+
+    def search(self, table: str, text: str):
+        """
+        Searches the full-text index of a table. The best matches come first.
+
+        Args:
+            table (str): The name of the table.
+            text (str): The searched text, matched as one phrase.
+
+        Returns:
+            sqlite3.Cursor: A cursor over the rank, a snippet with the match in [brackets] and the matching rows.
+        """
+        fts = quote(table + FTS_SUFFIX)
+        if table not in [index[0] for index in self.get_fts()]:
+            raise ValueError(f"Table {table} has no full-text index. Create one with: create fts {table} <columns>")
+        # An FTS5 phrase is quoted like an identifier
+        phrase = quote(text)
+        return self.query(f"SELECT round(f.rank, 2) AS rank, snippet({fts}, -1, '[', ']', '…', 16) AS snippet, t.* "
+                          f"FROM {fts} f JOIN {quote(table)} t ON t.rowid = f.rowid WHERE {fts} MATCH ? ORDER BY f.rank", (phrase,))
+
+    def explain(self, sql: str, params: tuple = ()):
+        """
+        Returns the query plan of an SQL statement.
+
+        Args:
+            sql (str): The SQL statement.
+            params (tuple): The statement parameters.
+
+        Returns:
+            list: The detail lines of EXPLAIN QUERY PLAN.
+        """
+        self.cur.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return [row[3] for row in self.cur.fetchall()]
+
+    def suggest_index(self, table: str, column: str, action: str = "del"):
+        """
+        Checks whether the statement run by del_record or edit_record scans the whole table.
+
+        Args:
+            table (str): The name of the table.
+            column (str): The name of the column used in the WHERE clause.
+            action (str): "del" for del_record, "edit" for edit_record.
+
+        Returns:
+            str: The CREATE INDEX statement that avoids the scan, or None if the statement already uses an index.
+        """
+        if action == "edit":
+            plan = self.explain(f"UPDATE {table} SET {column} = ? WHERE {column} = ?", (None, None))
+        else:
+            plan = self.explain(f"DELETE FROM {table} WHERE {column} = ?", (None,))
+        if any(detail.startswith("SCAN") for detail in plan):
+            return f"CREATE INDEX idx_{table}_{column} ON {table} ({column})"
+        return None
+
+    def get_values(self, table: str, column: str, prefix: str = None, limit: int = VALUES_PREVIEW):
+        """
+        Returns the first distinct values of a column in sorted order. With an index on the
+        column only about `limit` index entries are read.
+
+        Args:
+            table (str): The name of the table.
+            column (str): The name of the column.
+            prefix (str): Only return values that start with this text.
+            limit (int): The maximum number of values.
+
+        Returns:
+            list: The distinct values.
+        """
+        name = quote(column)
+        sql = f"SELECT DISTINCT {name} FROM {quote(table)} WHERE {name} IS NOT NULL"
+        params = []
+        if prefix:
+            # GLOB matches case-sensitively, so SQLite can use an index for the prefix
+            sql += f" AND {name} GLOB ?"
+            params.append(re.sub(r"([*?\[])", r"[\1]", prefix) + "*")
+        sql += f" ORDER BY {name} LIMIT ?"
+        params.append(limit)
+        return self._cached(("values", table, column, prefix, limit), lambda: [row[0] for row in self.conn.execute(sql, params).fetchall()])
+
+    def get_cardinality(self, table: str, column: str, sample: int = CARDINALITY_SAMPLE):
+        """
+        Estimates the number of distinct values in a column without reading the whole table.
+
+        The statistics of ANALYZE are used if an index starts with the column. Otherwise the
+        first `sample` values are counted and scaled to the table size with the GEE estimator.
+
+        Args:
+            table (str): The name of the table.
+            column (str): The name of the column.
+            sample (int): The number of rows read for the estimate.
+
+        Returns:
+            tuple: The estimated number of distinct values and whether it is exact.
+        """
+        if self.conn.execute("SELECT 1 FROM sqlite_master WHERE name='sqlite_stat1'").fetchone():
+            for name, _, columns, _ in self.get_indexes(table):
+                if columns.split(", ")[0] == column:
+                    row = self.conn.execute("SELECT stat FROM sqlite_stat1 WHERE tbl=? AND idx=?", (table, name)).fetchone()
+                    if row:
+                        rows, per_value = (int(number) for number in row[0].split()[:2])
+                        return max(rows // per_value, 1) if rows else 0, False
+
+        counts = self.conn.execute(f"SELECT COUNT(*) FROM (SELECT {quote(column)} AS value FROM {quote(table)} LIMIT ?) GROUP BY value", (sample,)).fetchall()
+        seen = sum(count for count, in counts)
+        if seen < sample:
+            return len(counts), True
+        if self.get_key_columns(table) == ["rowid"]:
+            rows = self.conn.execute(f"SELECT MAX(rowid) FROM {quote(table)}").fetchone()[0]
+        else:
+            rows = self.conn.execute(f"SELECT COUNT(*) FROM {quote(table)}").fetchone()[0]
+        once = sum(1 for count, in counts if count == 1)
+        return estimate_distinct(max(rows, seen), seen, len(counts), once), False
+
+    def describe(self, table: str, sample: int = None):
         """
-        Returns all data in a table.
+        Profiles every column of a table in one aggregate query: NULL count, estimated
+        distinct values, min, max, mean of the numeric values and the most frequent values.
+
+        Results are kept until the data of the database changes.
 
         Args:
             table (str): The name of the table.
+            sample (int): Read only about this percent of the rows, see _sample_source. The
+                row, NULL, distinct and value counts are scaled to the whole table, min, max
+                and mean are those of the sample. Tables of up to CARDINALITY_SAMPLE rows are
+                read in full.
 
         Returns:
-            list: A list of tuples containing all data in the table.
+            tuple: The number of rows and a list of dicts with column, type, nulls, distinct,
+            exact, min, max, mean, top, counted and sampled for every column. top leaves out
+            values that were seen only once.
         """
-        self.cur.execute(f"SELECT * FROM {table}")
-        return self.cur.fetchall()
+        if sample is not None and not 0 < sample <= 100:
+            raise ValueError("The sample must be a percent between 1 and 100.")
+        return self._cached(("describe", table, sample), lambda: self._describe(table, sample))
 
-    def del_table(self, table: str):
+    def _sample_source(self, table: str, sample: int):
         """
-        Deletes a table from the database.
+        Returns a FROM clause that reads about `sample` percent of a table.
 
-        Args:
-            table (str): The name of the table to be deleted.
-        """
-        try:
-            self.cur.execute(f"DROP TABLE {table}")
-            self.conn.commit()
+        The rowid range is split into SAMPLE_BLOCKS blocks and the start of every block is
+        read by rowid, so only the sampled pages are read. WITHOUT ROWID tables are read in
+        full and a random part of the rows is kept.
 
-        except Exception as e:
-            return print(f"Error | Method - del_table: {str(e)}")
-        
-        else:
-            return print("Successful!")
-        
-    def del_column(self, column: str, table: str):
+        Returns:
+            tuple: The FROM clause and the part of the table it reads, between 0 and 1, or
+            None if it is only known from the number of rows in the table.
         """
-        Deletes a column from a table.
+        quoted = quote(table)
+        if self.get_key_columns(table) != ["rowid"]:
+            return f"(SELECT * FROM {quoted} WHERE abs(random() % 100) < {sample})", None
 
-        Args:
-            column (str): The name of the column to be deleted.
-            table (str): The name of the table from which the column is to be deleted.
-        """
-        try:
-            self.cur.execute(f"ALTER TABLE {table} DROP COLUMN {column}")
-            self.conn.commit()
+        low, high = self.conn.execute(f"SELECT MIN(rowid), MAX(rowid) FROM {quoted}").fetchone()
+        if low is None:
+            return quoted, 1
+        span = high - low + 1
+        width = -(-span // SAMPLE_BLOCKS)
+        length = max(width * sample // 100, 1)
+        blocks = [(start, min(start + length, high + 1) - 1) for start in range(low, high + 1, width)]
+        values = ", ".join(f"({start}, {end})" for start, end in blocks)
+        # CROSS JOIN keeps the blocks as the outer loop, so each one is a rowid range search
+        source = (f"(WITH sample_blocks(block_start, block_end) AS (VALUES {values}) "
+                  f"SELECT {quoted}.* FROM sample_blocks CROSS JOIN {quoted} ON {quoted}.rowid BETWEEN block_start AND block_end)")
+        return source, sum(end - start + 1 for start, end in blocks) / span
+
+    def _describe(self, table: str, sample: int):
+        import json
+        columns = self.get_all_columns(table)
+        if not columns:
+            raise ValueError(f"Table {table} not found.")
+        self.conn.create_aggregate("column_profile", 1, ColumnProfile)
+        source, fraction = quote(table), 1
+        if sample and sample < 100:
+            source, fraction = self._sample_source(table, sample)
+        selects = ["COUNT(*)"]
+        for column in columns:
+            name = quote(column[1])
+            selects += [f"COUNT({name})", f"MIN({name})", f"MAX({name})",
+                        f"AVG(CASE WHEN typeof({name}) IN ('integer', 'real') THEN {name} END)", f"column_profile({name})"]
+        row = self.conn.execute(f'SELECT {", ".join(selects)} FROM {source}').fetchone()
+        if fraction is None:
+            total = self.conn.execute(f"SELECT COUNT(*) FROM {quote(table)}").fetchone()[0]
+            fraction = row[0] / total if total else 1
+        if fraction < 1 and (not row[0] or row[0] / fraction <= CARDINALITY_SAMPLE):
+            # An empty or small sample gives poor estimates, and small tables are cheap to read in full
+            return self._describe(table, None)
+
+        sampled = fraction < 1
+        rows = round(row[0] / fraction)
+        profiles = []
+        for index, column in enumerate(columns):
+            count, minimum, maximum, mean, profile = row[1 + index * 5:6 + index * 5]
+            # The aggregate returns NULL when the table has no rows at all
+            profile = json.loads(profile) if profile is not None else {"distinct": 0, "exact": True, "once": 0, "counted": True, "top": []}
+            # The sketch can overestimate, but there are never more distinct values than values
+            distinct = min(profile["distinct"], count)
+            if sampled and count:
+                distinct = estimate_distinct(max(round(count / fraction), count), count, distinct, profile["once"])
+            profiles.append({"column": column[1], "type": column[2], "nulls": round((row[0] - count) / fraction), "distinct": distinct,
+                             "exact": profile["exact"] and not sampled, "min": minimum, "max": maximum, "mean": mean,
+                             # Values seen once are not worth listing, e.g. in a column of unique ids
+                             "top": [[value, round(hits / fraction)] for value, hits in profile["top"] if hits > 1],
+                             "counted": profile["counted"] and not sampled, "sampled": sampled})
+        return rows, profiles
 
-        except Exception as e:
-            return print(f"Error | Method - del_column: {str(e)}")
-        
-        else:
-            return print("Successful!")
-        
     def del_record(self, table: str, column: str, value: str):
         """
         Deletes a record from a table.
@@ -128,7 +1435,7 @@ class Database:
         """
         try:
             self.cur.execute(f"DELETE FROM {table} WHERE {column} = ?", (value,))
-            self.conn.commit()
+            self.autocommit()
         except Exception as e:
             print(f"Error | Method - del_record: {str(e)}")
         else:
@@ -143,13 +1450,16 @@ class Database:
         """
         try:
             self.cur.execute(f"CREATE TABLE {table} (IgnoreOrDelete TEXT)")
-            self.conn.commit()
+            self.clear_schema_cache()
+            self.autocommit()
         except Exception as e:
             print(f"Error | Method - create_table: {str(e)}")
         else:
             print(f"Successful! Created table: {table} in Database: {self.nameDB}")
 
-    def create_column(self, column, table):
+    def create_column(self, column, table, type=None, primary_key=False, default=None):
+        # The type, primary key and default value are asked for unless the type is passed
+        interactive = type is None
         # Check if the input is not empty
         if not column:
             print("Column name cannot be empty")
@@ -158,23 +1468,27 @@ class Database:
             print("Table name cannot be empty")
             return
     
-        type = input("Enter the type: ")
+        if interactive:
+            type = input("Enter the type: ")
         if type.upper() in ["INTEGER", "TEXT", "REAL"]:
             parameters = [type.upper()]
             p_k = "PRIMARY KEY"
             d_v = "DEFAULT "
-            parametr = input("Make primary key? (y/n): ")
-            if parametr.lower() in ["y", "yes"]:
+            if interactive:
+                parametr = input("Make primary key? (y/n): ")
+                primary_key = parametr.lower() in ["y", "yes"]
+            if primary_key:
                 parameters.append(p_k)
     
-            parametr = input("Make default value? (y/n): ")
-            if parametr.lower() in ["y", "yes"]:
-                default = input("Enter default value: ")
-                if default:
-                    parameters.append(d_v+default)
-                else:
-                    print("Default value cannot be empty")
-                    return
+            if interactive:
+                parametr = input("Make default value? (y/n): ")
+                if parametr.lower() in ["y", "yes"]:
+                    default = input("Enter default value: ")
+                    if not default:
+                        print("Default value cannot be empty")
+                        return
+            if default:
+                parameters.append(d_v+default)
             parameters = " ".join(parameters)
     
         else:
@@ -184,19 +1498,21 @@ class Database:
         try:
             if type.upper() in ["INTEGER", "TEXT", "REAL"]:
                 self.cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {parameters};")
+                self.clear_schema_cache()
             # elif type.upper() == "TEXT":
             #     self.cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {type.upper()};")
-            self.conn.commit()
+            self.autocommit()
             print(f"Column '{column}' added to table '{table}'.")
         except sqlite3.OperationalError as e:
             print(f"Error | Method - create_column: {str(e)}")
 
-    def create_record(self, table: str):
+    def create_record(self, table: str, values: list = None):
         """
         Создает новую запись в таблице.
     
         Args:
             table (str): Название таблицы, в которой нужно создать запись.
+            values (list): Значения столбцов без первичного ключа. Если не переданы, запрашиваются у пользователя.
         """
         try:
             columns = self.get_all_columns(table)
@@ -204,34 +1520,127 @@ class Database:
                 raise ValueError(f"Table {table} not found.")
     
             non_primary_columns = [column[1] for column in columns if column[5] != 1]
-            values = []
-            for column in non_primary_columns:
-                value = input(f"Enter value for {column}: ")
-                values.append(value)
+            if values is None:
+                values = []
+                for column in non_primary_columns:
+                    value = input(f"Enter value for {column}: ")
+                    values.append(value)
     
             if len(values) != len(non_primary_columns):
                 raise ValueError("The number of provided values does not correspond to the number of columns, excluding the first and second columns.")
     
             sql = f"INSERT INTO {table} ({', '.join(non_primary_columns)}) VALUES ({', '.join('?' for _ in values)})"
             self.cur.execute(sql, values)
-            self.conn.commit()
+            self.autocommit()
         except Exception as e:
             print(f"Error | Method - create_record: {str(e)}")
         else:
-            values = ", ".join(values)
+            values = ", ".join(str(value) for value in values)
             print(f"\nSuccessful!\nTable: {table}\nDatabase: {self.nameDB}\nRecord: {values}")
 
+    def import_rows(self, table: str, columns: list, rows, chunk_size: int = IMPORT_CHUNK_SIZE, progress=None):
+        """
+        Inserts rows into a table in chunks inside one transaction.
+
+        The table is created if it does not exist, with column types guessed from the first chunk.
+        Outside of an open transaction the IMPORT_PRAGMAS are applied for the duration of the import.
+
+        Args:
+            table (str): The name of the table.
+            columns (list): The names of the columns the rows are inserted into.
+            rows (iterable): The rows to insert, as tuples.
+            chunk_size (int): The number of rows passed to one executemany call.
+            progress (callable): Called with the number of inserted rows after every chunk.
+
+        Returns:
+            int: The number of inserted rows.
+        """
+        if not columns:
+            raise ValueError("No columns to import.")
+        import transfer
+        chunks = transfer.chunks(rows, chunk_size)
+        first = next(chunks, [])
+
+        pragmas = {}
+        if not self.session:
+            if self.conn.in_transaction:
+                self.conn.commit()
+            for pragma, value in IMPORT_PRAGMAS.items():
+                self.cur.execute(f"PRAGMA {pragma}")
+                pragmas[pragma] = self.cur.fetchone()[0]
+                self.cur.execute(f"PRAGMA {pragma} = {value}")
+            self.cur.execute("BEGIN")
+        else:
+            self.cur.execute("SAVEPOINT import_rows")
+
+        # The names come from the file header, so they can be keywords or contain spaces and quotes
+        quoted = [quote(column) for column in columns]
+        name = quote(table)
+        count = 0
+        try:
+            if table not in [t[0] for t in self.get_all_tables()]:
+                types = [transfer.guess_type(row[index] for row in first) for index in range(len(columns))]
+                definition = ", ".join(f"{column} {column_type}" for column, column_type in zip(quoted, types))
+                self.cur.execute(f"CREATE TABLE {name} ({definition})")
+                self.clear_schema_cache()
+
+            sql = f"INSERT INTO {name} ({', '.join(quoted)}) VALUES ({', '.join('?' for _ in columns)})"
+            for chunk in itertools.chain([first], chunks):
+                self.cur.executemany(sql, chunk)
+                count += len(chunk)
+                if progress:
+                    progress(count)
+        except BaseException:
+            if self.session:
+                self.cur.execute("ROLLBACK TO SAVEPOINT import_rows")
+                self.cur.execute("RELEASE SAVEPOINT import_rows")
+            else:
+                self.conn.rollback()
+            self.clear_schema_cache()
+            raise
+        else:
+            if self.session:
+                self.cur.execute("RELEASE SAVEPOINT import_rows")
+            else:
+                self.conn.commit()
+        finally:
+            for pragma, value in pragmas.items():
+                self.cur.execute(f"PRAGMA {pragma} = {value}")
+        return count
+
     def rename_table(self, old_name: str, new_name: str):
         """
         Renames a table.
 
+        A full-text index names its table in the FTS5 table, its triggers and its content
+        option, so it is dropped and created again for the new name.
+
         Args:
             old_name (str): The name of the table to be renamed.
             new_name (str): The new name for the table.
         """
         try:
-            self.cur.execute(f"ALTER TABLE {old_name} RENAME TO {new_name}")
-            self.conn.commit()
+            fts = [columns for table, columns in self.get_fts() if table == old_name]
+            if fts:
+                sql = self.conn.execute("SELECT sql FROM sqlite_master WHERE name = ?", (f"{old_name}{FTS_SUFFIX}",)).fetchone()[0]
+                tokenizer = re.search(r"tokenize='(\w+)'", sql).group(1)
+            self.cur.execute("SAVEPOINT rename_table")
+            try:
+                if fts:
+                    self._drop_fts(old_name)
+                self.cur.execute(f"ALTER TABLE {quote(old_name)} RENAME TO {quote(new_name)}")
+                if fts:
+                    self._build_fts(new_name, fts[0], tokenizer)
+            except BaseException:
+                if self.conn.in_transaction:
+                    self.cur.execute("ROLLBACK TO SAVEPOINT rename_table")
+                    self.cur.execute("RELEASE SAVEPOINT rename_table")
+                raise
+            else:
+                self.cur.execute("RELEASE SAVEPOINT rename_table")
+            finally:
+                self.clear_schema_cache()
+            self.autocommit()
         except Exception as e:
             print(f"Error | Method - rename_table: {str(e)}")
         else:
@@ -248,26 +1657,161 @@ class Database:
         """
         try:
             self.cur.execute(f"ALTER TABLE {table} RENAME COLUMN {old_name} TO {new_name}")
-            self.conn.commit()
+            self.clear_schema_cache()
+            self.autocommit()
         except Exception as e:
             print(f"Error | Method - rename_column: {str(e)}")
         else:
             print(f"Successful!\nTable: {table}\nDatabase: {self.nameDB}\nColumn: {old_name}\nNew name: {new_name}")
 
-    def edit_column(self, table: str, column: str, new_type: str):
+    def _copy_batches(self, table: str, insert: str, chunk_size: int, progress=None):
         """
-        Edits the type of a column in a table.
+        Runs an INSERT ... SELECT ... FROM table statement in batches of `chunk_size` rows
+        in key order, so every statement touches a bounded number of rows.
+
+        Args:
+            table (str): The table the rows are selected from.
+            insert (str): The INSERT ... SELECT statement without a WHERE clause.
+            chunk_size (int): The number of rows per statement.
+            progress (callable): Called with the number of copied rows after every batch.
+
+        Returns:
+            int: The number of copied rows.
+        """
+        keys = self.get_key_columns(table)
+        key = ", ".join(quote(column) for column in keys)
+        placeholders = ", ".join("?" for _ in keys)
+        count = 0
+        last = None
+        while True:
+            where = f" WHERE ({key}) > ({placeholders})" if last is not None else ""
+            bound = self.conn.execute(f"SELECT {key} FROM {quote(table)}{where} ORDER BY {key} LIMIT 1 OFFSET ?", (*(last or ()), chunk_size - 1)).fetchone()
+            if bound is None:
+                self.cur.execute(insert + where, last or ())
+            else:
+                upper = f"({key}) <= ({placeholders})"
+                self.cur.execute(insert + (f"{where} AND {upper}" if where else f" WHERE {upper}"), (*(last or ()), *bound))
+            count += self.cur.rowcount
+            if progress:
+                progress(count)
+            if bound is None:
+                return count
+            last = bound
+
+    def rebuild_table(self, table: str, types: dict = None, drop: list = None, chunk_size: int = REBUILD_CHUNK_SIZE, progress=None):
+        """
+        Rebuilds a table with changed column types or without some columns, for the schema
+        changes SQLite's ALTER TABLE can't make.
+
+        A new table is created from the original definition, the rows are copied in
+        INSERT ... SELECT batches of `chunk_size` rows ordered by key, so memory use does not
+        depend on the table size, and the new table replaces the old one. Indexes, triggers
+        and views are recreated, and so are triggers on other tables that use the table,
+        which would fail on the missing table during the rename. Everything happens inside one savepoint, so a failure leaves
+        the table unchanged.
+
+        Args:
+            table (str): The name of the table.
+            types (dict): The new type of every changed column by name.
+            drop (list): The names of the columns to remove.
+            chunk_size (int): The number of rows copied per statement.
+            progress (callable): Called with the number of copied rows after every batch.
+
+        Returns:
+            int: The number of copied rows.
+        """
+        types = types or {}
+        drop = drop or []
+        if self.conn.execute("PRAGMA foreign_keys").fetchone()[0] and self.conn.in_transaction:
+            raise ValueError("Foreign keys are enabled. Commit the open transaction first.")
+
+        row = self.conn.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (table,)).fetchone()
+        if row is None:
+            raise ValueError(f"Table {table} not found.")
+        _, definitions, tail = split_definitions(row[0])
+        columns = [definition_column(definition) for definition in definitions]
+        for column in list(types) + drop:
+            if column not in columns:
+                raise ValueError(f"Column {column} not found in table {table}.")
+
+        new_definitions = []
+        for column, definition in zip(columns, definitions):
+            if column in drop:
+                continue
+            new_definitions.append(replace_type(definition, types[column]) if column in types else definition)
+        generated = {column[1] for column in self.conn.execute(f"PRAGMA table_xinfo({quote(table)})") if column[6] in [2, 3]}
+        kept = [column for column in columns if column is not None and column not in drop and column not in generated]
+        if not kept:
+            raise ValueError("Can't remove every column of a table.")
+
+        temp = f"{table}__rebuild"
+        schema = self.conn.execute("SELECT type, name, tbl_name, sql FROM sqlite_master WHERE sql IS NOT NULL AND type IN ('index', 'trigger', 'view') ORDER BY rowid").fetchall()
+        views = [name for kind, name, tbl_name, sql in schema if kind == "view"]
+        triggers = [name for kind, name, tbl_name, sql in schema
+                    if kind == "trigger" and tbl_name != table and tbl_name not in views and references(sql, table)]
+        recreate = [sql for kind, name, tbl_name, sql in schema if kind == "view" or tbl_name == table or (kind == "trigger" and tbl_name in views) or name in triggers]
+        sequence = None
+        if self.conn.execute("SELECT 1 FROM sqlite_master WHERE name='sqlite_sequence'").fetchone():
+            sequence = self.conn.execute("SELECT seq FROM sqlite_sequence WHERE name=?", (table,)).fetchone()
+
+        names = ", ".join(quote(column) for column in kept)
+        copied = ["rowid"] if self.get_key_columns(table) == ["rowid"] else []
+        insert = f'INSERT INTO {quote(temp)} ({", ".join(copied + [names])}) SELECT {", ".join(copied + [names])} FROM {quote(table)}'
+        foreign_keys = self.conn.execute("PRAGMA foreign_keys").fetchone()[0]
+
+        if foreign_keys:
+            self.conn.execute("PRAGMA foreign_keys = OFF")
+        self.cur.execute("SAVEPOINT rebuild_table")
+        try:
+            self.cur.execute(f'CREATE TABLE {quote(temp)} ({", ".join(new_definitions)}{tail}')
+            count = self._copy_batches(table, insert, chunk_size, progress)
+
+            for view in views:
+                self.cur.execute(f"DROP VIEW {quote(view)}")
+            for trigger in triggers:
+                self.cur.execute(f"DROP TRIGGER {quote(trigger)}")
+            self.cur.execute(f"DROP TABLE {quote(table)}")
+            self.cur.execute(f"ALTER TABLE {quote(temp)} RENAME TO {quote(table)}")
+            for sql in recreate:
+                self.cur.execute(sql)
+            if sequence is not None:
+                self.cur.execute("UPDATE sqlite_sequence SET seq = ? WHERE name = ?", (sequence[0], table))
+            if foreign_keys:
+                violation = self.conn.execute(f"PRAGMA foreign_key_check({quote(table)})").fetchone()
+                if violation is not None:
+                    raise ValueError(f"Foreign key constraint failed in table {violation[0]} at rowid {violation[1]}.")
+        except BaseException:
+            # An interrupted statement can roll back the whole transaction
+            if self.conn.in_transaction:
+                self.cur.execute("ROLLBACK TO SAVEPOINT rebuild_table")
+                self.cur.execute("RELEASE SAVEPOINT rebuild_table")
+            raise
+        else:
+            self.cur.execute("RELEASE SAVEPOINT rebuild_table")
+        finally:
+            self.clear_schema_cache()
+            if foreign_keys:
+                self.conn.execute("PRAGMA foreign_keys = ON")
+        return count
+
+    def edit_column_type(self, table: str, column: str, new_type: str, progress=None):
+        """
+        Edits the type of a column in a table by rebuilding the table. Values are converted
+        to the affinity of the new type while they are copied.
 
         Args:
             table (str): The name of the table in which the column is to be edited.
             column (str): The name of the column to be edited.
             new_type (str): The new type for the column.
+            progress (callable): Called with the number of copied rows.
         """
         try:
-            self.cur.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {new_type}")
-            self.conn.commit()
+            count = self.rebuild_table(table, types={column: new_type}, progress=progress)
+            self.autocommit()
+            if progress:
+                progress(count, done=True)
         except Exception as e:
-            print(f"Error | Method - edit_column: {str(e)}")
+            print(f"Error | Method - edit_column_type: {str(e)}")
         else:
             print(f"Successful!\nTable: {table}\nDatabase: {self.nameDB}\nColumn: {column}\nNew type: {new_type}")
 
@@ -283,8 +1827,477 @@ class Database:
         """
         try:
             self.cur.execute(f"UPDATE {table} SET {column} = ? WHERE {column} = ?", (new_value, value))
-            self.conn.commit()
+            self.autocommit()
         except Exception as e:
             print(f"Error | Method - edit_record: {str(e)}")
         else:
-            print(f"Successful!\nTable: {table}\nDatabase: {self.nameDB}\nColumn: {column}\nValue: {value}\nNew value: {new_value}")
\ No newline at end of file
+            print(f"Successful!\nTable: {table}\nDatabase: {self.nameDB}\nColumn: {column}\nValue: {value}\nNew value: {new_value}")
+
+
+# Every public Database method except close is measured, long-running ones can be canceled
+for name, method in list(vars(Database).items()):
+    if callable(method) and not name.startswith("_") and name != "close":
+        if name in INTERRUPTIBLE:
+            method = interruptible(method)
+        setattr(Database, name, measured(f"Database.{name}", method))
+del name, method
+
+
+class ResultCache:
+    """
+    Keeps the results of read methods, least recently used first, while the database is unchanged.
+
+    Attributes:
+        max_bytes (int): The approximate memory limit of the kept results.
+        results (OrderedDict): The (result, size) of every key.
+        bytes (int): The approximate size of the kept results.
+        version (tuple): The database version the results belong to.
+        hits (int): The number of results returned from the cache.
+        misses (int): The number of results that had to be read.
+        evictions (int): The number of results dropped to stay under max_bytes.
+    """
+
+    def __init__(self, max_bytes: int = RESULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.results = OrderedDict()
+        self.bytes = 0
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def check(self, version: tuple):
+        """
+        Drops every result if the database version has changed.
+        """
+        if version != self.version:
+            self.clear()
+            self.version = version
+
+    def get(self, key: tuple):
+        """
+        Returns whether a result is kept for the key, and the result.
+        """
+        if key in self.results:
+            self.results.move_to_end(key)
+            self.hits += 1
+            return True, self.results[key][0]
+        self.misses += 1
+        return False, None
+
+    def put(self, key: tuple, result):
+        """
+        Keeps a result, dropping the least recently used ones above max_bytes.
+        Results larger than max_bytes are not kept.
+        """
+        rows, size = result_size(result)
+        size += 64 * rows + 256
+        if size > self.max_bytes:
+            return
+        self.results[key] = (result, size)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, (_, dropped) = self.results.popitem(last=False)
+            self.bytes -= dropped
+            self.evictions += 1
+
+    def clear(self):
+        """
+        Drops every result. The hit and miss counters are kept.
+        """
+        self.results.clear()
+        self.bytes = 0
+        self.version = None
+
+    def summary(self):
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: hits, misses, evictions, entries and bytes.
+        """
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "entries": len(self.results), "bytes": self.bytes}
+
+
+class StatementCache:
+    """
+    Keeps the most recently parsed SQL statements, least recently used first.
+
+    Attributes:
+        size (int): The maximum number of statements kept.
+        statements (OrderedDict): The parsed statements by SQL text.
+    """
+
+    def __init__(self, size: int = STATEMENT_CACHE_SIZE):
+        self.size = size
+        self.statements = OrderedDict()
+
+    def get(self, sql: str):
+        """
+        Returns the parsed statement for an SQL text, parsing it if needed.
+
+        Args:
+            sql (str): The SQL statement.
+
+        Returns:
+            Statement: The statement text without the trailing semicolon, its first keyword
+            and whether it changes the database.
+        """
+        if sql in self.statements:
+            self.statements.move_to_end(sql)
+            return self.statements[sql]
+
+        text = sql.strip().rstrip(";").strip()
+        if not text:
+            raise ValueError("Empty statement.")
+        if not sqlite3.complete_statement(text + "\n;"):
+            raise ValueError("Incomplete statement.")
+        words = re.sub(r"--[^\n]*|/\*.*?\*/", " ", text, flags=re.S).split()
+        kind = words[0].upper() if words else ""
+        if kind == "WITH":
+            upper = [word.upper() for word in words]
+            writes = any(keyword in upper for keyword in ["INSERT", "UPDATE", "DELETE", "REPLACE"])
+        else:
+            writes = kind not in READ_KEYWORDS
+
+        statement = Statement(text, kind, writes)
+        self.statements[sql] = statement
+        if len(self.statements) > self.size:
+            self.statements.popitem(last=False)
+        return statement
+
+
+class TablePager:
+    """
+    Pages through a table one page at a time.
+
+    Attributes:
+        db (Database): The database the table belongs to.
+        table (str): The name of the table.
+        size (int): The number of rows per page.
+        page (int): The number of the current page, starting at 1.
+        headers (list): The column names of the table.
+        rows (list): The rows of the current page.
+    """
+
+    def __init__(self, db: Database, table: str, size: int = PAGE_SIZE):
+        self.db = db
+        self.table = table
+        self.size = size
+        self.page = 0
+        self.headers = []
+        self.rows = []
+        self._keys = []
+
+    def _load(self, page: int, **bounds):
+        headers, rows = self.db.get_page(self.table, self.size, **bounds)
+        if not rows:
+            return None
+        self.headers = headers
+        self._keys = [key for key, _ in rows]
+        self.rows = [row for _, row in rows]
+        self.page = page
+        return self.rows
+
+    def first(self):
+        """
+        Loads the first page.
+
+        Returns:
+            list: The rows of the page, or None if the table is empty.
+        """
+        return self._load(1)
+
+    def next(self):
+        """
+        Loads the page after the current one.
+
+        Returns:
+            list: The rows of the page, or None if the current page is the last one.
+        """
+        if len(self.rows) < self.size:
+            return None
+        return self._load(self.page + 1, after=self._keys[-1])
+
+    def prev(self):
+        """
+        Loads the page before the current one.
+
+        Returns:
+            list: The rows of the page, or None if the current page is the first one.
+        """
+        if self.page <= 1:
+            return None
+        return self._load(self.page - 1, before=self._keys[0])
+
+    def jump(self, page: int):
+        """
+        Loads the page with the given number.
+
+        Args:
+            page (int): The number of the page, starting at 1.
+
+        Returns:
+            list: The rows of the page, or None if there is no such page.
+        """
+        if page < 1:
+            return None
+        if page == 1:
+            return self.first()
+        key = self.db.get_key_at(self.table, (page - 1) * self.size - 1)
+        if key is None:
+            return None
+        return self._load(page, after=tuple(key))
+
+
+class CursorPager:
+    """
+    Pages through the rows of an executed cursor.
+
+    The cursor can only move forward, so the last PAGER_HISTORY pages are kept to go back to.
+
+    Attributes:
+        cursor (sqlite3.Cursor): The executed cursor.
+        size (int): The number of rows per page.
+        page (int): The number of the current page, starting at 1.
+        headers (list): The column names of the result.
+        rows (list): The rows of the current page.
+    """
+
+    def __init__(self, cursor, size: int = PAGE_SIZE):
+        self.cursor = cursor
+        self.size = size
+        self.page = 0
+        self.headers = [description[0] for description in cursor.description or []]
+        self.rows = []
+        self.history = OrderedDict()
+        self.fetched = 0
+
+    def _fetch(self):
+        rows = run_interruptible(self.cursor.connection, self.cursor.fetchmany, self.size)
+        if not rows:
+            return None
+        self.fetched += 1
+        self.history[self.fetched] = rows
+        if len(self.history) > PAGER_HISTORY:
+            self.history.popitem(last=False)
+        return rows
+
+    def _show(self, page: int):
+        self.page = page
+        self.rows = self.history[page]
+        return self.rows
+
+    def first(self):
+        """
+        Loads the first page.
+
+        Returns:
+            list: The rows of the page, or None if the result is empty.
+        """
+        return self.jump(1)
+
+    def next(self):
+        """
+        Loads the page after the current one.
+
+        Returns:
+            list: The rows of the page, or None if the current page is the last one.
+        """
+        return self.jump(self.page + 1)
+
+    def prev(self):
+        """
+        Loads the page before the current one.
+
+        Returns:
+            list: The rows of the page, or None if it is no longer kept.
+        """
+        return self.jump(self.page - 1)
+
+    def jump(self, page: int):
+        """
+        Loads the page with the given number. Pages after the last fetched one are read
+        from the cursor, earlier pages only while they are kept in the history.
+
+        Args:
+            page (int): The number of the page, starting at 1.
+
+        Returns:
+            list: The rows of the page, or None if there is no such page.
+        """
+        if page in self.history:
+            return self._show(page)
+        if page <= self.fetched:
+            return None
+        while self.fetched < page:
+            if (self.history and len(self.history[self.fetched]) < self.size) or self._fetch() is None:
+                return None
+        return self._show(page)
+
+
+class ConnectionRegistry:
+    """
+    Keeps the most recently used databases open, so switching between them reuses the
+    connection and its page cache.
+
+    Attributes:
+        size (int): The maximum number of open databases.
+        databases (OrderedDict): The open databases by file path, least recently used first.
+        profiles (dict): The performance profile chosen for a file path, used when it is opened again.
+    """
+
+    def __init__(self, size: int = REGISTRY_SIZE):
+        self.size = size
+        self.databases = OrderedDict()
+        self.profiles = {}
+
+    @staticmethod
+    def key(nameDB: str) -> str:
+        """
+        Returns the path a database file is registered under, with symbolic links resolved,
+        so that it is the same as Database.path.
+        """
+        return os.path.realpath(os.path.join("files", nameDB))
+
+    def get(self, nameDB: str, create: bool = None):
+        """
+        Returns the open database for a file, opening it if needed.
+
+        Args:
+            nameDB (str): The name of the database file.
+            create (bool): Whether to create a missing database file. Asks the user if not set.
+
+        Returns:
+            Database: The database.
+        """
+        path = self.key(nameDB)
+        if path in self.databases:
+            self.databases.move_to_end(path)
+            return self.databases[path]
+
+        db = Database(nameDB, create, self.profiles.get(path, DEFAULT_PROFILE))
+        self.databases[path] = db
+        for old_path, old_db in list(self.databases.items())[:-1]:
+            if len(self.databases) <= self.size:
+                break
+            if not old_db.session:
+                old_db.close()
+                del self.databases[old_path]
+        return db
+
+    def set_profile(self, db: Database, profile: str):
+        """
+        Applies a performance profile to a database and remembers it for the next time the file is opened.
+
+        Args:
+            db (Database): The database.
+            profile (str): The name of the profile from PROFILES.
+        """
+        db.set_profile(profile)
+        self.profiles[db.path] = profile
+
+    def close(self, nameDB: str):
+        """
+        Closes the database for a file if it is open.
+
+        Args:
+            nameDB (str): The name of the database file.
+        """
+        db = self.databases.pop(self.key(nameDB), None)
+        if db is not None:
+            db.close()
+
+    def close_all(self):
+        """
+        Closes all open databases.
+        """
+        for db in self.databases.values():
+            db.close()
+        self.databases.clear()
+
+
+def read_file_info(path: str):
+    """
+    Reads the page count and table count of a database file through a read-only connection.
+
+    Returns:
+        tuple: The page count and table count, or None for both if the file can't be read.
+    """
+    try:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            pages = conn.execute("PRAGMA page_count").fetchone()[0]
+            tables = conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type='table'").fetchone()[0]
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return None, None
+    return pages, tables
+
+
+class Catalog:
+    """
+    Lists the database files in a directory with their size, page count, table count and modification time.
+
+    The file list is only read again when the modification time of the directory changes, and
+    the metadata of a file is only read again when its size or modification time changes.
+
+    Attributes:
+        directory (str): The directory with the database files.
+        workers (int): The number of threads reading file metadata.
+        mtime (int): The modification time of the directory when the file list was read.
+        files (list): The names of the database files.
+        info (dict): The metadata of every file by name.
+    """
+
+    def __init__(self, directory: str = "files", workers: int = CATALOG_WORKERS):
+        self.directory = directory
+        self.workers = workers
+        self.mtime = None
+        self.files = []
+        self.info = {}
+
+    def names(self):
+        """
+        Returns the names of the database files, reading the directory only if it changed.
+
+        Returns:
+            list: The sorted file names.
+        """
+        mtime = os.stat(self.directory).st_mtime_ns
+        if mtime != self.mtime:
+            with os.scandir(self.directory) as entries:
+                self.files = sorted(entry.name for entry in entries if entry.name.endswith(".db") and entry.is_file())
+            self.mtime = mtime
+            self.info = {name: info for name, info in self.info.items() if name in self.files}
+        return list(self.files)
+
+    def get_info(self):
+        """
+        Returns the metadata of every database file. Files that changed since the last
+        call are read concurrently.
+
+        Returns:
+            list: A list of dicts with name, size, pages, tables and modified.
+        """
+        stale = {}
+        for name in self.names():
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            info = self.info.get(name)
+            if info is None or (info["size"], info["mtime"]) != (stat.st_size, stat.st_mtime_ns):
+                stale[name] = {"name": name, "size": stat.st_size, "mtime": stat.st_mtime_ns, "modified": stat.st_mtime}
+
+        if stale:
+            paths = [os.path.join(self.directory, name) for name in stale]
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                for info, (pages, tables) in zip(stale.values(), executor.map(read_file_info, paths)):
+                    info["pages"] = pages
+                    info["tables"] = tables
+                    self.info[info["name"]] = info
+
+        return [self.info[name] for name in self.files if name in self.info]
\ No newline at end of file
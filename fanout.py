@@ -0,0 +1,207 @@
+import fnmatch
+import os
+import signal
+import sqlite3
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.managers import SyncManager
+from queue import Full
+
+FETCH_SIZE = 1000
+# Chunks a worker can send ahead before it waits for the main process to read them
+QUEUE_CHUNKS = 4
+MERGE_FUNCTIONS = ["key", "count", "sum", "min", "max"]
+GET_OPERATIONS = {
+    "tables": "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name",
+    "columns": "SELECT * FROM pragma_table_info(?)",
+    "count": 'SELECT COUNT(*) FROM "{table}"',
+    "data": 'SELECT * FROM "{table}"',
+}
+
+
+def get_query(operation: str, table: str = None):
+    """
+    Returns the SQL and parameters of a fixed get operation.
+
+    Args:
+        operation (str): tables, columns, count or data.
+        table (str): The table for columns, count and data.
+
+    Returns:
+        tuple: The SQL statement and its parameters.
+    """
+    if operation not in GET_OPERATIONS:
+        raise ValueError(f"Invalid operation. Available operations: {', '.join(GET_OPERATIONS)}")
+    if operation == "tables":
+        return GET_OPERATIONS[operation], ()
+    if not table:
+        raise ValueError(f"get {operation} requires a table name.")
+    if operation == "columns":
+        return GET_OPERATIONS[operation], (table,)
+    return GET_OPERATIONS[operation].format(table=table.replace('"', '""')), ()
+
+
+def start_worker():
+    # Ctrl+C is handled by the main process, which cancels the remaining databases
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def send(queue, stop, message) -> bool:
+    """
+    Puts a message in a bounded queue, waiting while it is full until `stop` is set.
+
+    Returns:
+        bool: False if the main process stopped reading.
+    """
+    while not stop.is_set():
+        try:
+            queue.put(message, timeout=0.1)
+            return True
+        except Full:
+            pass
+    return False
+
+
+def query_file(path: str, sql: str, params: tuple, queue, stop):
+    """
+    Runs a query on one database file through a read-only connection. Runs in a worker process.
+
+    The results are sent to `queue` as messages: ("headers", column names), then
+    ("rows", up to FETCH_SIZE rows) until ("done", None), or ("error", message) if the
+    query fails.
+    """
+    try:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            conn.execute("PRAGMA query_only = ON")
+            cursor = conn.execute(sql, params)
+            # Most errors are raised by the first step, before anything is sent
+            rows = cursor.fetchmany(FETCH_SIZE)
+            if not send(queue, stop, ("headers", [description[0] for description in cursor.description or []])):
+                return
+            while rows:
+                if not send(queue, stop, ("rows", rows)):
+                    return
+                rows = cursor.fetchmany(FETCH_SIZE)
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        send(queue, stop, ("error", str(e)))
+        return
+    send(queue, stop, ("done", None))
+
+
+def match_files(names: list, pattern: str) -> list:
+    """
+    Returns the database names that match a shell pattern like shard_*. A pattern
+    without .db also matches the name without its extension.
+    """
+    return [name for name in names if fnmatch.fnmatchcase(name, pattern) or fnmatch.fnmatchcase(name[:-3], pattern)]
+
+
+def run(directory: str, names: list, sql: str, params: tuple = (), workers: int = None):
+    """
+    Runs a query on every database in parallel, one worker process per CPU.
+
+    Rows are streamed from the workers in chunks and only as many databases as there are
+    workers are queried at a time, so the memory used does not depend on the size or the
+    number of the results.
+
+    Args:
+        directory (str): The directory with the database files.
+        names (list): The names of the database files.
+        sql (str): The read-only query.
+        params (tuple): The query parameters.
+        workers (int): The number of worker processes. Defaults to the number of CPUs.
+
+    Yields:
+        tuple: The database name, column names, an iterator over the rows and an error
+        message or None for every database, in the order of `names`. The rows have to be
+        read before the next database is yielded, else they are skipped. An error after
+        the first rows is raised as ValueError while the rows are read.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(names) or 1)
+    manager = SyncManager()
+    manager.start(start_worker)
+    stop = manager.Event()
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=start_worker)
+    waiting = iter(names)
+    running = deque()
+
+    def submit():
+        name = next(waiting, None)
+        if name is not None:
+            queue = manager.Queue(QUEUE_CHUNKS)
+            running.append((name, queue, executor.submit(query_file, os.path.join(directory, name), sql, params, queue, stop)))
+
+    def read(name, queue):
+        while True:
+            kind, value = queue.get()
+            if kind == "rows":
+                yield from value
+            elif kind == "error":
+                raise ValueError(f"{name}: {value}")
+            else:
+                return
+
+    try:
+        for _ in range(workers):
+            submit()
+        while running:
+            name, queue, future = running.popleft()
+            kind, value = queue.get()
+            if kind == "error":
+                yield name, [], iter(()), value
+            else:
+                rows = read(name, queue)
+                yield name, value, rows, None
+                for _ in rows:
+                    pass
+            future.result()
+            submit()
+    finally:
+        stop.set()
+        executor.shutdown(wait=True, cancel_futures=True)
+        manager.shutdown()
+
+
+def merge_rows(rows, functions: list):
+    """
+    Combines the partial results of the databases into one row per group.
+
+    Columns marked key group the rows. count and sum columns are added up, min and max
+    columns keep the smallest and largest value. NULLs are skipped.
+
+    Args:
+        rows (iterable): The rows of all databases.
+        functions (list): One of MERGE_FUNCTIONS for every column.
+
+    Returns:
+        list: The merged rows in the order their groups first appeared.
+    """
+    for function in functions:
+        if function not in MERGE_FUNCTIONS:
+            raise ValueError(f"Invalid merge function {function}. Available functions: {', '.join(MERGE_FUNCTIONS)}")
+    keys = [index for index, function in enumerate(functions) if function == "key"]
+    groups = {}
+    for row in rows:
+        if len(row) != len(functions):
+            raise ValueError(f"The query returns {len(row)} columns, but {len(functions)} merge functions are given.")
+        group = tuple(row[index] for index in keys)
+        merged = groups.get(group)
+        if merged is None:
+            groups[group] = list(row)
+            continue
+        for index, function in enumerate(functions):
+            value = row[index]
+            if function == "key" or value is None:
+                continue
+            if merged[index] is None:
+                merged[index] = value
+            elif function in ["count", "sum"]:
+                merged[index] += value
+            elif function == "min":
+                merged[index] = min(merged[index], value)
+            elif function == "max":
+                merged[index] = max(merged[index], value)
+    return [tuple(row) for row in groups.values()]
@@ -1,23 +1,60 @@
 import sqlite3
 import os
+import itertools
+import shlex
+import time
 import logging
-from tabulate import tabulate
 
-from classes import Database
+import render
+from classes import FTS_TOKENIZERS, PROFILES, VALUES_PREVIEW, Catalog, ConnectionRegistry, CursorPager, Database, StatementCache, TablePager, stats
 
-logging.basicConfig(filename='logs/function_logs.log', filemode='a', format='%(levelname)s -> %(asctime)s: %(message)s', level=logging.DEBUG)
+registry = ConnectionRegistry()
+catalog = Catalog()
+batch = False
+output = "table"
+# The lookups already checked by advise_index in batch mode, as (database path, table, column)
+advised = set()
+
+def tabulate(*args, **kwargs):
+    """
+    Renders a table with the tabulate package, which is only imported on first use to keep startup fast.
+    """
+    from tabulate import tabulate as render
+    return render(*args, **kwargs)
+
+def ask(args: list, prompt: str, default: str = None) -> str:
+    """
+    Returns the next inline argument of a command, or asks the user for it.
+
+    In batch mode nobody can answer, so a missing argument falls back to `default`
+    or raises an error.
+    """
+    if args:
+        return args.pop(0)
+    if batch:
+        if default is None:
+            raise ValueError(f"Missing argument: {prompt.strip().rstrip(':')}")
+        return default
+    return input(prompt)
+
+def hint(args: list, *text):
+    """
+    Prints a hint for the next prompt. Skipped when the answer is already given inline or in batch mode.
+    """
+    if not args and not batch:
+        print(*text)
 
 def is_valid_command(command: str, commands: list) -> bool:
     """
     Checks if a given command is valid.
     """
-    return command.lower() in commands or command.lower().startswith(("edit ", "rename ", "create ", "del ", "get ", "select "))
+    return command.lower() in commands or command.lower().startswith(("edit ", "rename ", "create ", "del ", "get ", "select ", "savepoint ", "release ", "rollback to ", "attach ", "detach ", "sql ", "query ", "import ", "export ", "delete_db ", "create_db ", "stats ", "profile ", "output ", "fanout ", "search ", "describe ", "backup_db ", "restore_db "))
 
 def create_database(name: str):
     if ".db" not in name:
         name = name + ".db"
         print(f"Creating database {name}...")
-        database_files = os.listdir("files")
+        database_files = catalog.names()
         if name not in database_files:
             try:
                 conn = sqlite3.connect(f"files/{name}")
@@ -29,6 +66,126 @@ def create_database(name: str):
             logging.error(f"Error | Method - create_database: Database {name} already exists.")
             print(f"Database {name} already exists.")
 
+def read_copy_options(args: list):
+    """
+    Reads the optional `pages <count>` and `sleep <milliseconds>` arguments of backup_db and restore_db.
+
+    Returns:
+        tuple: The pages per step and the sleep between steps in seconds.
+    """
+    import backup
+    options = {"pages": backup.BACKUP_PAGES, "sleep": backup.BACKUP_SLEEP * 1000}
+    while args:
+        option = args.pop(0).lower()
+        if option not in options or not args or not args[0].lstrip("-").isdigit():
+            raise ValueError("Options: pages <count>, sleep <milliseconds>")
+        options[option] = int(args.pop(0))
+    if options["pages"] == 0 or options["pages"] < -1 or options["sleep"] < 0:
+        raise ValueError("pages must be -1 or above 0 and sleep can't be negative.")
+    return options["pages"], options["sleep"] / 1000
+
+def show_copy_progress(action: str):
+    """
+    Returns a callback that prints the copied bytes and the throughput of every stage of a backup or restore.
+    """
+    # A stage starts when the previous one reported last
+    state = {"stage": None, "start": 0.0, "printed": 0.0, "called": time.perf_counter()}
+
+    def progress(stage: str, done: int, total: int):
+        now = time.perf_counter()
+        if stage != state["stage"]:
+            if state["stage"] is not None:
+                print()
+            state.update(stage=stage, start=state["called"], printed=0.0)
+        state["called"] = now
+        if (total and done >= total) or now - state["printed"] >= 0.5:
+            state["printed"] = now
+            elapsed = now - state["start"]
+            rate = done / elapsed if elapsed > 0 else 0
+            of = f" of {format_size(total)} ({done * 100 // total}%)" if total else ""
+            print(f"\r{action}, {stage}: {format_size(done)}{of}, {format_size(rate)}/s   ", end="", flush=True)
+
+    return progress
+
+def command_backup(db: Database, command: str):
+    try:
+        args = shlex.split(command)[1:]
+        default_name = db.nameDB if db is not None else None
+        hint(args, "\nDatabases:", ", ".join(catalog.names()))
+        name = ask(args, f"\nDatabase name{f' [{default_name}]' if default_name else ''}: ", default_name) or default_name
+        if name == "cancel":
+            print("\nOk. Canceled.")
+            return
+        if not name:
+            raise ValueError("No database provided. Try again.")
+        if ".db" not in name:
+            name += ".db"
+
+        import backup
+        default_path = os.path.join(backup.BACKUP_DIRECTORY, f"{name[:-3]}-{time.strftime('%Y%m%d-%H%M%S')}.db")
+        path = ask(args, f"\nBackup file (.db, optionally .gz or .xz) [{default_path}]: ", default_path) or default_path
+        if path == "cancel":
+            print("\nOk. Canceled.")
+            return
+        pages, sleep = read_copy_options(args)
+
+        source = registry.get(name, False)
+        start = time.perf_counter()
+        size = source.backup(path, pages, sleep, progress=show_copy_progress("Backup"))
+        elapsed = time.perf_counter() - start
+        print()
+    except Exception as e:
+        logging.error(f"Error: {str(e)}")
+        print(f"\nError: {str(e)}")
+    else:
+        logging.info(f"Backed up {name} to {path} in {elapsed:.2f} s.")
+        print(f"\nSuccessful!\nDatabase: {name}\nFile: {path}\nSize: {format_size(size)}\nTime: {elapsed:.2f} s")
+
+def command_restore(db: Database, command: str):
+    try:
+        args = shlex.split(command)[1:]
+        path = ask(args, "\nBackup file: ")
+        if path == "cancel":
+            print("\nOk. Canceled.")
+            return
+        if not os.path.isfile(path):
+            raise ValueError(f"File {path} not found.")
+
+        default_name = db.nameDB if db is not None else os.path.basename(path).split("-")[0].split(".")[0] + ".db"
+        hint(args, "\nDatabases:", ", ".join(catalog.names()))
+        name = ask(args, f"\nDatabase name [{default_name}]: ", default_name) or default_name
+        if name == "cancel":
+            print("\nOk. Canceled.")
+            return
+        if ".db" not in name:
+            name += ".db"
+        pages, sleep = read_copy_options(args)
+
+        if name in catalog.names():
+            question = ask([], f"Are you sure you want to replace database {name} with {path}? (y/n): ", "y")
+            if question.lower() not in ["y", "yes"]:
+                print("Canceled.")
+                return
+
+        created = name not in catalog.names()
+        target = registry.get(name, True)
+        start = time.perf_counter()
+        try:
+            target.restore(path, pages, sleep, progress=show_copy_progress("Restore"))
+        except BaseException:
+            if created:
+                registry.close(name)
+                os.remove(f"files/{name}")
+            raise
+        elapsed = time.perf_counter() - start
+        print()
+    except Exception as e:
+        logging.error(f"Error: {str(e)}")
+        print(f"\nError: {str(e)}")
+    else:
+        logging.info(f"Restored {name} from {path} in {elapsed:.2f} s.")
+        print(f"\nSuccessful!\nDatabase: {name}\nFile: {path}\nTime: {elapsed:.2f} s")
+
 def delete_database(db: Database, name: str):
     if db is not None:
         print("Ops, you can't delete the database while you are using it.\nPlease, enter the command `select cancel` to close up the database.")
@@ -36,10 +193,11 @@ def delete_database(db: Database, name: str):
     else:
         if ".db" not in name:
             name = name + ".db"
-            if name in os.listdir("files"):
-                question = input(f"Are you sure you want to delete database {name}? (y/n): ")
+            if name in catalog.names():
+                question = ask([], f"Are you sure you want to delete database {name}? (y/n): ", "y")
                 if question.lower() in ["y", "yes"]:
                     try:
+                        registry.close(name)
                         os.remove(f"files/{name}")
                         logging.info(f"Successful! Deleted database: {name}.")
                     except Exception as e:
@@ -62,21 +220,47 @@ def show_help():
                 ["get", "show tables, columns and data in selected database", "table_name"],
                 ["get tables", "show tables in selected database", ""],
                 ["get columns", "show columns in selected table", "table_name"],
-                ["get data", "show data in selected table", "table_name, column_name"],
+                ["get data", "show data in selected table page by page", "table_name"],
+                ["get indexes", "show indexes in selected database", ""],
+                ["get attached", "show databases attached to selected database", ""],
+                ["describe", "show nulls, distinct values, min, max, mean and top values of every column", "table_name, sample percent"],
+                ["get stats", "show rows, size and indexes of every table, Ctrl+C cancels", ""],
                 ["del", "delete table, column, record from selected database", "table_name, column_name, record_id"],
                 ["del table", "delete table from selected database", "table_name"],
                 ["del column", "delete column from selected table", "table_name, column_name"],
                 ["del record", "delete record from selected table", "table_name, column_name, value"],
+                ["del index", "delete index from selected database", "index_name"],
+                ["del fts", "delete full-text index of selected table", "table_name"],
                 ["create", "create new table, column, record in selected database", "table_name, column_name, value"],
                 ["create table", "create new table in selected database", "table_name"],
                 ["create column", "create new column in selected table", "table_name, column_name, data_type"],
                 ["create record", "create new record in selected table", "table_name, column_name=value"],
+                ["create index", "create index on columns of selected table", "table_name, column_names"],
+                ["create fts", "create full-text index on text columns, kept in sync by triggers", "table_name, column_names, trigram or unicode61"],
                 ["edit", "edit database, table, column, record", "table_name, column_name=value, record_id"],
-                ["edit column", "edit column in selected table", "table_name, column_name, data_type"],
+                ["edit column", "change column type, the table is rebuilt", "table_name, column_name, data_type"],
                 ["edit record", "edit record in selected table", "table_name, column_name=value"],
                 ["rename", "rename table, column", "database_name, table_name, column_name"],
                 ["rename table", "rename table in selected database", "table_name"],
                 ["rename column", "rename column in selected table", "table_name, column_name, new_column_name"],
+                ["search", "find rows by text with a full-text index, best matches first", "table_name, text"],
+                ["sql", "run SQL statement on selected database, alias: query", "statement"],
+                ["import", "import CSV or JSON Lines file into table", "file_path, table_name"],
+                ["export", "export table or query result to CSV or JSON Lines (.gz, .xz)", "table_name or query, file_path"],
+                ["begin", "start a transaction, changes are saved on commit", ""],
+                ["commit", "save changes of the open transaction", ""],
+                ["rollback", "undo changes of the open transaction", ""],
+                ["savepoint", "create savepoint in the open transaction", "savepoint_name"],
+                ["release", "release savepoint and keep its changes", "savepoint_name"],
+                ["rollback to", "undo changes made after savepoint", "savepoint_name"],
+                ["attach", "attach database to selected database, use its tables as alias.table", "database_name, alias"],
+                ["detach", "detach attached database", "alias"],
+                ["profile", "show or set performance profile of selected database: " + ", ".join(PROFILES), "profile_name"],
+                ["fanout", "run a read-only query or get tables|columns|count|data on every matching database, merge results with merge key,count,sum,min,max", "pattern, query, merge functions"],
+                ["output", "show or set how rows are printed: " + ", ".join(render.FORMATS), "format"],
+                ["stats", "show count and latency of commands and database calls", "json [file_path], reset"],
+                ["backup_db", "copy a database to a file while it is in use, .gz or .xz compresses it", "database_name, file_path, pages count, sleep milliseconds"],
+                ["restore_db", "replace a database with a backup file", "file_path, database_name, pages count, sleep milliseconds"],
                 ["delete_db", "delete selected database", "database_name"],
                 ["create_db", "create new database", "database_name"],
                 ["clear", "clear the screen", ""],
@@ -98,20 +282,104 @@ def select_command(command: str):
     else:
         if ".db" not in select:
             select += ".db"
-            db = Database(select)
+            db = registry.get(select, False if batch else None)
         else:
-            db = Database(select)
+            db = registry.get(select, False if batch else None)
         logging.info(f"Selected database: {select}")
         print(f"\nSelected database: {select}")
     return db
 
-def command_showdbs(databases, formatted_databases):
+def format_size(size: int) -> str:
+    for unit in ["B", "KB", "MB", "GB"]:
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+def command_showdbs():
+    databases = catalog.get_info()
     if not databases:
         logging.info(f"No databases found.")
         print("\nNo databases found. Try again.")
     else:
+        formatted_databases = ', '.join(info["name"] for info in databases)
         logging.info(f"Available databases: {formatted_databases}")
-        print(f"\nAvailable databases: {formatted_databases}")
+        headers = ["Database", "Size", "Pages", "Tables", "Modified"]
+        table_data = [[info["name"], format_size(info["size"]), info["pages"], info["tables"],
+                       time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(info["modified"]))] for info in databases]
+        table = tabulate(table_data, headers=headers, tablefmt="heavy_outline", missingval="?")
+        print(f"\nAvailable databases:\n{table}")
+
+def advise_index(db: Database, table: str, column: str, action: str):
+    """
+    Warns when looking up records by a column scans the whole table and offers to create an index.
+
+    A script can run the same lookup thousands of times, so in batch mode every column is only checked once.
+    """
+    if batch:
+        if (db.path, table, column) in advised:
+            return
+        advised.add((db.path, table, column))
+    try:
+        suggestion = db.suggest_index(table, column, action)
+    except Exception as e:
+        logging.error(f"Error | Method - advise_index: {str(e)}")
+        return
+
+    if suggestion:
+        logging.info(f"Full table scan on {table}.{column}. Suggested: {suggestion}")
+        print(f"\nColumn {column} has no index, every lookup scans the whole table {table}.\nSuggested: {suggestion}")
+        if not batch and input("Create index now? (y/n): ").lower() in ["y", "yes"]:
+            db.create_index(table, [column])
+
+def show_values(db: Database, table: str, column: str, prefix: str = None):
+    values = db.get_values(table, column, prefix)
+    if not values:
+        print(f"\nNo values starting with {prefix}." if prefix else "\nNo values.")
+    else:
+        more = ", ..." if len(values) == VALUES_PREVIEW else ""
+        print("\nValues:", ", ".join(str(value) for value in values) + more)
+
+def ask_value(db: Database, args: list, table: str, column: str) -> str:
+    """
+    Asks for a value of a column and shows the first distinct values of the column.
+
+    Tab completes the typed prefix if readline is available, and an answer ending
+    with * lists the values with that prefix and asks again.
+    """
+    if args or batch:
+        return ask(args, "\nValue: ")
+
+    count, exact = db.get_cardinality(table, column)
+    print(f"\n{count if exact else f'About {count}'} distinct values in {column}. Type the start of a value and press Tab, or end it with * to list matches.")
+    show_values(db, table, column)
+
+    try:
+        import readline
+    except ImportError:
+        readline = None
+    if readline is not None:
+        matches = []
+
+        def complete(text, state):
+            if state == 0:
+                matches[:] = [str(value) for value in db.get_values(table, column, text)]
+            return matches[state] if state < len(matches) else None
+
+        old_completer, old_delims = readline.get_completer(), readline.get_completer_delims()
+        readline.set_completer(complete)
+        readline.set_completer_delims("")
+        readline.parse_and_bind("tab: complete")
+
+    try:
+        while True:
+            value = input("\nValue: ")
+            if not value.endswith("*") or value == "*":
+                return value
+            show_values(db, table, column, value[:-1])
+    finally:
+        if readline is not None:
+            readline.set_completer(old_completer)
+            readline.set_completer_delims(old_delims)
 
 def command_get_tables(db: Database):
     if db is None:
@@ -127,11 +395,10 @@ def command_get_tables(db: Database):
     if not tables:
         print("\nNo tables in selected database.")
     else:
-        print(f"\nTables in {db.nameDB}:")
+        if output == "table":
+            print(f"\nTables in {db.nameDB}:")
         headers = ["№", "Table"]
-        table_data = [[index, table[0]] for index, table in enumerate(tables, start=1)]
-        table = tabulate(table_data, headers=headers, tablefmt="heavy_outline")
-        print(table)
+        render.render(headers, ((index, table[0]) for index, table in enumerate(tables, start=1)), output)
 
 def command_get_columns(db: Database, table_name: str):
     if db is None:
@@ -147,15 +414,7 @@ def command_get_columns(db: Database, table_name: str):
         try:
             columns = db.get_all_columns(table_name)
             headers = ["№", "Position", "Name", "Type", "NULL", "Default_value", "Primary_Key"]
-            table_data = [[index, *column] for index, column in enumerate(columns, 1)]
-        
-            for row in table_data:
-                for index, value in enumerate(row):
-                    if value is None:
-                        row[index] = "None"
-                
-            table = tabulate(table_data, headers=headers, tablefmt="heavy_outline")
-            print(table)
+            render.render(headers, ((index, *column) for index, column in enumerate(columns, 1)), output, missing="None")
             if not columns:
                 raise ValueError("No columns in selected table.")
         
@@ -171,20 +430,91 @@ def command_get_data(db: Database, table_name: str):
     try:
         if table_name not in [t[0] for t in db.get_all_tables()]:
             raise ValueError("Table not found. Try again.")
-        
-        data = db.get_all_data(table_name)
-        if not data:
+
+        pager = TablePager(db, table_name)
+        if not pager.first():
             raise ValueError("No data in selected table.")
     except Exception as e:
         logging.error(f"Error: {str(e)}")
         print(f"\nError: {str(e)}")
     else:
-        columns = [column[1] for column in db.get_all_columns(table_name)]
-        table_data = [dict(zip(columns, row)) for row in data]
-                
-        t = tabulate(table_data, headers="keys", tablefmt="heavy_outline")
-        print(f"Table: {table_name}")
-        print(t)
+        show_pages(pager, f"Table: {table_name}")
+
+def command_get_stats(db: Database):
+    if db.session:
+        print("\nTransaction is open. Uncommitted changes are not counted.")
+
+    def progress(done: int, total: int):
+        if not batch:
+            print(f"\rCounting tables: {done}/{total}", end="\n" if done == total else "", flush=True)
+
+    try:
+        table_stats = db.get_table_stats(progress=progress)
+    except KeyboardInterrupt:
+        print("\nOk. Canceled.")
+        return
+    if not table_stats:
+        print("\nNo tables in selected database.")
+        return
+
+    headers = ["Table", "Rows", "Size", "Indexes", "Index size", "Avg row size"]
+    table_data = [[info["table"], info["rows"],
+                   format_size(info["size"]) if info["size"] is not None else None,
+                   info["indexes"],
+                   format_size(info["index_size"]) if info["index_size"] is not None else None,
+                   format_size(info["avg_row_size"]) if info["avg_row_size"] is not None else None] for info in table_stats]
+    if output == "table":
+        print()
+    render.render(headers, table_data, output, missing="?")
+
+def show_pages(pager, title: str):
+    """
+    Prints the current page of a pager and lets the user move between pages.
+    """
+    if batch:
+        # Without a user to page, all rows are printed in one table as they are read
+        def rows():
+            while True:
+                yield from pager.rows
+                if pager.next() is None:
+                    return
+
+        if output == "table":
+            print(title)
+        render.render(pager.headers, rows(), output)
+        return
+
+    show = True
+    while True:
+        if show:
+            if output == "table":
+                print(f"{title} | Page: {pager.page}")
+            render.render(pager.headers, pager.rows, output)
+
+            if pager.page == 1 and len(pager.rows) < pager.size:
+                return
+
+        show = False
+        action = input("\n[n]ext, [p]rev, [j]ump <page>, [q]uit: ").strip().lower().split()
+        if not action or action[0] in ["n", "next"]:
+            show = pager.next() is not None
+            if not show:
+                print("\nNo next page.")
+        elif action[0] in ["p", "prev"]:
+            show = pager.prev() is not None
+            if not show:
+                print("\nNo previous page.")
+        elif action[0] in ["j", "jump"]:
+            if len(action) < 2 or not action[1].isdigit():
+                print("\nEnter the page number, for example: j 10")
+            else:
+                show = pager.jump(int(action[1])) is not None
+                if not show:
+                    print(f"\nPage {action[1]} not found.")
+        elif action[0] in ["q", "quit", "cancel"]:
+            return
+        else:
+            print("\nInvalid action. Try again.")
 
 def command_get(db: Database, command: str):
     if db is None:
@@ -195,24 +525,43 @@ def command_get(db: Database, command: str):
         tables = db.get_all_tables()
         table_names = [table[0] for table in tables]
         try:
-            command = command.split(" ")
-            if command[1] == "" or command[1] == " ":
+            command = shlex.split(command)
+            args = command[2:]
+            if len(command) < 2:
                 raise ValueError("No parameter provided. Try again.")
             else:
                 if command[1] == "tables":
                     command_get_tables(db)
 
+                elif command[1] == "indexes":
+                    indexes = db.get_indexes()
+                    if not indexes:
+                        print("\nNo indexes in selected database.")
+                    else:
+                        table_data = [[name, table, columns, "Yes" if unique else "No"] for name, table, columns, unique in indexes]
+                        render.render(["Index", "Table", "Columns", "Unique"], table_data, output)
+
+                elif command[1] == "attached":
+                    attached = db.get_attached()
+                    if not attached:
+                        print("\nNo attached databases.")
+                    else:
+                        render.render(["Alias", "File"], attached, output)
+
+                elif command[1] == "stats":
+                    command_get_stats(db)
+
                 elif command[1] == "columns":
-                    print("\nTables:", ", ".join(table_names))
-                    table_name = input("\nTable name: ")
+                    hint(args, "\nTables:", ", ".join(table_names))
+                    table_name = ask(args, "\nTable name: ")
                     if table_name == "cancel":
                         print("\nOk. Canceled.")
                     else:
                         command_get_columns(db, table_name)
 
                 elif command[1] == "data":
-                    print("\nTables:", ", ".join(table_names))
-                    table_name = input("\nTable name: ")
+                    hint(args, "\nTables:", ", ".join(table_names))
+                    table_name = ask(args, "\nTable name: ")
                     if table_name == "cancel":
                         print("\nOk. Canceled.")
                     else:
@@ -232,8 +581,9 @@ def command_del(db: Database, command: str):
 
     else:
         try:
-            command = command.split(" ")
-            if command[1] == "" or command[1] == " ":
+            command = shlex.split(command)
+            args = command[2:]
+            if len(command) < 2:
                 raise ValueError("No parameter provided. Try again.")
             else:
                 tables = db.get_all_tables()
@@ -241,47 +591,66 @@ def command_del(db: Database, command: str):
 
                 
                 if command[1] == "table":
-                    print("\nTables:", ", ".join(table_names))
-                    table = input("\nTable name: ")
+                    hint(args, "\nTables:", ", ".join(table_names))
+                    table = ask(args, "\nTable name: ")
                     if table == "cancel":
                         print("\nOk. Canceled.")
                     else:
                         db.del_table(table)
 
                 elif command[1] == "column":
-                    print("\nTables:", ", ".join(table_names))
-                    table = input("\nTable name: ")
+                    hint(args, "\nTables:", ", ".join(table_names))
+                    table = ask(args, "\nTable name: ")
                     if table == "cancel":
                         print("\nOk. Canceled.")
                     else:
                         columns = db.get_all_columns(table)
                         column_names = [column[1] for column in columns]
-                        print("\nColumns:", ", ".join(column_names))
-                        column = input("\nColumn name: ")
+                        hint(args, "\nColumns:", ", ".join(column_names))
+                        column = ask(args, "\nColumn name: ")
                         if column == "cancel":
                             print("\nOk. Canceled.")
                         else:
                             db.del_column(column, table)
 
                 elif command[1] == "record":
-                    print("\nTables:", ", ".join(table_names))
-                    table = input("\nTable name: ")
+                    hint(args, "\nTables:", ", ".join(table_names))
+                    table = ask(args, "\nTable name: ")
                     if table == "cancel":
                         print("\nOk. Canceled.")
                     
                     else:
-                        print("\nColumns:", ", ".join(column_names))
-                        column = input("\nColumn name: ")
+                        column_names = [column[1] for column in db.get_all_columns(table)]
+                        hint(args, "\nColumns:", ", ".join(column_names))
+                        column = ask(args, "\nColumn name: ")
                         if column == "cancel":
                             print("\nOk. Canceled.")
                             
                         else:
-                            value = input("\nValue: ")
+                            advise_index(db, table, column, "del")
+                            value = ask(args, "\nValue: ")
                             if value == "cancel":
                                 print("\nOk. Canceled.")
                             else:
                                 db.del_record(table, column, value)
 
+                elif command[1] == "index":
+                    indexes = [index[0] for index in db.get_indexes()]
+                    hint(args, "\nIndexes:", ", ".join(indexes))
+                    name = ask(args, "\nIndex name: ")
+                    if name == "cancel":
+                        print("\nOk. Canceled.")
+                    else:
+                        db.del_index(name)
+
+                elif command[1] == "fts":
+                    hint(args, "\nTables with full-text index:", ", ".join(index[0] for index in db.get_fts()))
+                    table = ask(args, "\nTable name: ")
+                    if table == "cancel":
+                        print("\nOk. Canceled.")
+                    else:
+                        db.del_fts(table)
+
                 else:
                     raise ValueError("Invalid parameter. Try again.")
 
@@ -296,8 +665,9 @@ def command_create(db: Database, command: str):
 
     else:
         try:
-            command = command.split(" ")
-            if command[1] == "" or command[1] == " ":
+            command = shlex.split(command)
+            args = command[2:]
+            if len(command) < 2:
                 raise ValueError("No parameter provided. Try again.")
             else:
                 tables = db.get_all_tables()
@@ -308,8 +678,8 @@ def command_create(db: Database, command: str):
                         logging.info(f"No database selected.")
                         print("\nNo database selected.")
                     else:
-                        print("\nAvailable tables:", ", ".join(table_names))
-                        table = input("\nTable name: ")
+                        hint(args, "\nAvailable tables:", ", ".join(table_names))
+                        table = ask(args, "\nTable name: ")
                         if table.lower() == "cancel":
                             print("\nOk. Canceled.")
                         else:
@@ -321,14 +691,19 @@ def command_create(db: Database, command: str):
                         print("\nNo database selected.")
                     else:
                         tables = [t[0] for t in db.get_all_tables()]
-                        print("\nAvailable tables:", ", ".join(tables))
-                        table = input("\nTable name: ")
+                        hint(args, "\nAvailable tables:", ", ".join(tables))
+                        table = ask(args, "\nTable name: ")
                         if table.lower() == "cancel":
                             print("\nOk. Canceled.")
                         else:
-                            column = input("\nColumn name: ")
+                            column = ask(args, "\nColumn name: ")
                             if column.lower() == "cancel":
                                 print("\nOk. Canceled.")
+                            elif args or batch:
+                                column_type = ask(args, "Enter the type: ")
+                                primary_key = ask(args, "Make primary key? (y/n): ", "n").lower() in ["y", "yes", "pk"]
+                                default = ask(args, "Default value: ", "") or None
+                                db.create_column(column, table, column_type, primary_key, default)
                             else:
                                 db.create_column(column, table)
                             
@@ -338,13 +713,53 @@ def command_create(db: Database, command: str):
                         print("\nNo database selected.")
                     else:
                         tables = [t[0] for t in db.get_all_tables()]
-                        print("\nAvailable tables:", ", ".join(tables))
-                        table = input("\nTable name: ")
+                        hint(args, "\nAvailable tables:", ", ".join(tables))
+                        table = ask(args, "\nTable name: ")
                         if table == "cancel":
                             print("\nOk. Canceled.")
+                        elif args or batch:
+                            db.create_record(table, args)
                         else:
                             db.create_record(table)
 
+                elif command[1] == "index":
+                    tables = [t[0] for t in db.get_all_tables()]
+                    hint(args, "\nAvailable tables:", ", ".join(tables))
+                    table = ask(args, "\nTable name: ")
+                    if table == "cancel":
+                        print("\nOk. Canceled.")
+                    else:
+                        column_names = [column[1] for column in db.get_all_columns(table)]
+                        hint(args, "\nAvailable columns:", ", ".join(column_names))
+                        columns = ask(args, "\nColumn names (comma separated): ")
+                        if columns == "cancel":
+                            print("\nOk. Canceled.")
+                        else:
+                            unique = ask(args, "\nMake unique? (y/n): ", "n")
+                            columns = [column.strip() for column in columns.split(",") if column.strip()]
+                            db.create_index(table, columns, unique=unique.lower() in ["y", "yes"])
+
+                elif command[1] == "fts":
+                    tables = [t[0] for t in db.get_all_tables()]
+                    hint(args, "\nAvailable tables:", ", ".join(tables))
+                    table = ask(args, "\nTable name: ")
+                    if table == "cancel":
+                        print("\nOk. Canceled.")
+                    else:
+                        column_names = [column[1] for column in db.get_all_columns(table) if "CHAR" in column[2].upper() or "TEXT" in column[2].upper() or not column[2]]
+                        hint(args, "\nText columns:", ", ".join(column_names))
+                        columns = ask(args, "\nColumn names (comma separated): ")
+                        if columns == "cancel":
+                            print("\nOk. Canceled.")
+                        else:
+                            tokenizer = ask(args, f"\nMatch parts of words or whole words? ({'/'.join(FTS_TOKENIZERS)}) [trigram]: ", "trigram") or "trigram"
+                            columns = [column.strip() for column in columns.split(",") if column.strip()]
+                            progress = show_progress("Indexed", time.perf_counter())
+                            count = db.create_fts(table, columns, tokenizer, progress=progress)
+                            progress(count, done=True)
+                            logging.info(f"Created full-text index on {table} ({', '.join(columns)})")
+                            print(f"\nSuccessful! Created full-text index on {table} ({', '.join(columns)})\nSearch it with: search {table} <text>")
+
                 else:
                     raise ValueError("Invalid parameter. Try again.")
 
@@ -359,8 +774,9 @@ def command_rename(db: Database, command: str):
 
     else:
         try:
-            command = command.split(" ")
-            if command[1] == "" or command[1] == " ":
+            command = shlex.split(command)
+            args = command[2:]
+            if len(command) < 2:
                 raise ValueError("No parameter provided. Try again.")
             else:
 
@@ -370,12 +786,12 @@ def command_rename(db: Database, command: str):
                         print("\nNo database selected.")
                     else:
                         tables = [t[0] for t in db.get_all_tables()]
-                        print("\nAvailable tables:", ", ".join(tables))
-                        table = input("\nTable name: ")
+                        hint(args, "\nAvailable tables:", ", ".join(tables))
+                        table = ask(args, "\nTable name: ")
                         if table == "cancel":
                             print("\nOk. Canceled.")
                         else:
-                            new_name = input("\nNew table name: ")
+                            new_name = ask(args, "\nNew table name: ")
                             if new_name == "cancel":
                                 print("\nOk. Canceled.")
                             else:
@@ -387,17 +803,17 @@ def command_rename(db: Database, command: str):
                         print("\nNo database selected.")
                     else:
                         tables = [t[0] for t in db.get_all_tables()]
-                        print("\nAvailable tables:", ", ".join(tables))
-                        table = input("\nTable name: ")
+                        hint(args, "\nAvailable tables:", ", ".join(tables))
+                        table = ask(args, "\nTable name: ")
                         if table == "cancel":
                             print("\nOk. Canceled.")
                         else:
                             columns = [c[0] for c in db.get_all_columns(table)]
-                            column = input("\nColumn name: ")
+                            column = ask(args, "\nColumn name: ")
                             if column == "cancel":
                                 print("\nOk. Canceled.")
                             else:
-                                new_name = input("\nNew column name: ")
+                                new_name = ask(args, "\nNew column name: ")
                                 if new_name == "cancel":
                                     print("\nOk. Canceled.")
                                 else:
@@ -417,8 +833,9 @@ def command_edit(db: Database, command: str):
 
     else:
         try:
-            command = command.split(" ")
-            if command[1] == "" or command[1] == " ":
+            command = shlex.split(command)
+            args = command[2:]
+            if len(command) < 2:
                 raise ValueError("No parameter provided. Try again.")
             else:
                 tables = db.get_all_tables()
@@ -430,20 +847,21 @@ def command_edit(db: Database, command: str):
                         print("\nNo database selected.")
                     else:
                         tables = [t[0] for t in db.get_all_tables()]
-                        print("\nAvailable tables:", ", ".join(tables))
-                        table = input("\nTable name: ")
+                        hint(args, "\nAvailable tables:", ", ".join(tables))
+                        table = ask(args, "\nTable name: ")
                         if table == "cancel":
                             print("\nOk. Canceled.")
                         else:
-                            column = input("\nColumn name: ")
+                            column = ask(args, "\nColumn name: ")
                             if column == "cancel":
                                 print("\nOk. Canceled.")
                             else:
-                                new_column_type = input("\nNew column type: ")
+                                new_column_type = ask(args, "\nNew column type: ")
                                 if new_column_type == "cancel":
                                     print("\nOk. Canceled.")
                                 else:
-                                    db.edit_column_type(table, column, new_column_type)
+                                    progress = show_progress("Copied", time.perf_counter())
+                                    db.edit_column_type(table, column, new_column_type, progress=progress)
 
                 elif command[1] == "record":
                     if db is None:
@@ -452,35 +870,28 @@ def command_edit(db: Database, command: str):
                     else:
                         
                         tables = [t[0] for t in db.get_all_tables()]
-                        print("\nAvailable tables:", ", ".join(tables))
+                        hint(args, "\nAvailable tables:", ", ".join(tables))
                         
-                        table = input("\nTable name: ")
+                        table = ask(args, "\nTable name: ")
                         if table == "cancel":
                             print("\nOk. Canceled.")
                         else:
                             columns = db.get_all_columns(table)
                             column_names = [column[1] for column in columns]
                             
-                            print("\nAvailable columns:", ", ".join(column_names))
+                            hint(args, "\nAvailable columns:", ", ".join(column_names))
                             
-                            column = input("\nColumn name: ")
+                            column = ask(args, "\nColumn name: ")
                             if column == "cancel":
                                 print("\nOk. Canceled.")
                             else:
-                                
-                                id_column = db.get_all_columns(table)
-                                id_column_name = id_column[0]
-                                
-                                values_in_selected_column = db.get_all_data(table)
-                                values_in_selected_column = [value[id_column_name] for value in values_in_selected_column] 
-                                
-                                print("\nAvailable values:", "\n".join(values_in_selected_column))
-                                
-                                value = input("\nValue: ")
+                                advise_index(db, table, column, "edit")
+
+                                value = ask_value(db, args, table, column)
                                 if value == "cancel":
                                     print("\nOk. Canceled.")
                                 else:
-                                    new_value = input("\nNew value: ")
+                                    new_value = ask(args, "\nNew value: ")
                                     if new_value == "cancel":
                                         print("\nOk. Canceled.")
                                     else:
@@ -489,6 +900,423 @@ def command_edit(db: Database, command: str):
                 else:
                     raise ValueError("Invalid parameter. Try again.")
 
+        except Exception as e:
+            logging.error(f"Error: {str(e)}")
+            print(f"\nError: {str(e)}")
+
+def command_transaction(db: Database, command: str):
+    if db is None:
+        logging.info(f"No database selected.")
+        print("\nNo database selected.")
+
+    else:
+        try:
+            command = command.split()
+            if command[0].lower() == "begin":
+                db.begin()
+
+            elif command[0].lower() == "commit":
+                db.commit()
+
+            elif command[0].lower() == "rollback" and len(command) == 1:
+                db.rollback()
+
+            elif len(command) < 2 or (command[0].lower() == "rollback" and len(command) < 3):
+                raise ValueError("No savepoint name provided. Try again.")
+
+            elif command[0].lower() == "savepoint":
+                db.savepoint(command[1])
+
+            elif command[0].lower() == "release":
+                db.release(command[1])
+
+            elif command[0].lower() == "rollback" and command[1].lower() == "to":
+                db.rollback_to(command[2])
+
+            else:
+                raise ValueError("Invalid parameter. Try again.")
+
+        except Exception as e:
+            logging.error(f"Error: {str(e)}")
+            print(f"\nError: {str(e)}")
+
+def show_progress(action: str, start: float):
+    """
+    Returns a callback that prints how many rows were processed and the rate in rows per second.
+    """
+    last = [0.0]
+
+    def progress(count: int, done: bool = False):
+        now = time.perf_counter()
+        if done or now - last[0] >= 0.5:
+            last[0] = now
+            elapsed = now - start
+            rate = count / elapsed if elapsed > 0 else 0
+            print(f"\r{action}: {count} rows ({rate:.0f} rows/s)", end="\n" if done else "", flush=True)
+
+    return progress
+
+def command_import(db: Database, command: str = "import"):
+    if db is None:
+        logging.info(f"No database selected.")
+        print("\nNo database selected.")
+
+    else:
+        try:
+            args = shlex.split(command)[1:]
+            path = ask(args, "\nFile path (.csv or .jsonl): ")
+            if path == "cancel":
+                print("\nOk. Canceled.")
+                return
+            if not os.path.isfile(path):
+                raise ValueError(f"File {path} not found.")
+
+            default_table = os.path.basename(path).split(".")[0]
+            hint(args, "\nTables:", ", ".join(t[0] for t in db.get_all_tables()))
+            table = ask(args, f"\nTable name [{default_table}]: ", default_table) or default_table
+            if table == "cancel":
+                print("\nOk. Canceled.")
+                return
+
+            import transfer
+            columns, rows = transfer.read_file(path)
+            start = time.perf_counter()
+            progress = show_progress("Imported", start)
+            count = db.import_rows(table, columns, rows, progress=progress)
+            progress(count, done=True)
+        except Exception as e:
+            logging.error(f"Error: {str(e)}")
+            print(f"\nError: {str(e)}")
+        else:
+            logging.info(f"Imported {count} rows from {path} into table {table}.")
+            print(f"\nSuccessful!\nTable: {table}\nDatabase: {db.nameDB}\nRows: {count}")
+
+def command_export(db: Database, command: str = "export"):
+    if db is None:
+        logging.info(f"No database selected.")
+        print("\nNo database selected.")
+
+    else:
+        try:
+            args = shlex.split(command)[1:]
+            hint(args, "\nTables:", ", ".join(t[0] for t in db.get_all_tables()))
+            source = ask(args, "\nTable name or SELECT query: ").strip()
+            if source == "cancel":
+                print("\nOk. Canceled.")
+                return
+
+            if source.lower().startswith(("select ", "with ")):
+                sql = source
+                default_path = "export.csv"
+            elif source in [t[0] for t in db.get_all_tables()]:
+                sql = f"SELECT * FROM {source}"
+                default_path = f"{source}.csv"
+            else:
+                raise ValueError("Table not found. Try again.")
+
+            path = ask(args, f"\nFile path (.csv, .jsonl, optionally .gz or .xz) [{default_path}]: ", default_path) or default_path
+            if path == "cancel":
+                print("\nOk. Canceled.")
+                return
+
+            cursor = db.query(sql)
+            headers = [description[0] for description in cursor.description]
+            start = time.perf_counter()
+            progress = show_progress("Exported", start)
+            import transfer
+            count = transfer.write_file(path, headers, cursor, progress=progress)
+            progress(count, done=True)
+            cursor.close()
+        except Exception as e:
+            logging.error(f"Error: {str(e)}")
+            print(f"\nError: {str(e)}")
+        else:
+            logging.info(f"Exported {count} rows to {path}.")
+            print(f"\nSuccessful!\nFile: {path}\nRows: {count}\nSize: {os.path.getsize(path)} bytes")
+
+def command_attach(db: Database, command: str):
+    if db is None:
+        logging.info(f"No database selected.")
+        print("\nNo database selected.")
+
+    else:
+        try:
+            command = command.split()
+            if command[0].lower() == "attach":
+                if len(command) < 2:
+                    raise ValueError("No database provided. Try again.")
+                alias = command[2] if len(command) > 2 else command[1].replace(".db", "")
+                db.attach(command[1], alias)
+
+            else:
+                if len(command) < 2:
+                    raise ValueError("No alias provided. Try again.")
+                db.detach(command[1])
+
+        except Exception as e:
+            logging.error(f"Error: {str(e)}")
+            print(f"\nError: {str(e)}")
+
+def command_sql(db: Database, command: str):
+    if db is None:
+        logging.info(f"No database selected.")
+        print("\nNo database selected.")
+
+    else:
+        try:
+            sql = command.split(" ", 1)[1].strip() if " " in command.strip() else ""
+            if not sql:
+                sql = ask([], "\nSQL (end with ;): ")
+                while sql != "cancel" and not sqlite3.complete_statement(sql):
+                    sql += "\n" + input("... ")
+            if sql == "cancel":
+                print("\nOk. Canceled.")
+                return
+
+            start = time.perf_counter()
+            cursor, statement = db.execute_sql(sql)
+            pager = CursorPager(cursor)
+            rows = pager.first() if cursor.description else None
+            elapsed = time.perf_counter() - start
+        except Exception as e:
+            logging.error(f"Error: {str(e)}")
+            print(f"\nError: {str(e)}")
+        else:
+            logging.info(f"Executed SQL in {elapsed * 1000:.2f} ms: {sql}")
+            if cursor.description is None and cursor.rowcount >= 0:
+                print(f"\nSuccessful! {statement.kind}, rows affected: {cursor.rowcount}")
+            elif cursor.description is None:
+                print(f"\nSuccessful! {statement.kind}")
+            elif not rows:
+                print("\nNo rows.")
+            else:
+                show_pages(pager, "Query")
+            print(f"\nTime: {elapsed * 1000:.2f} ms")
+
+def command_stats(command: str):
+    try:
+        args = shlex.split(command)[1:]
+        summary = stats.summary()
+
+        if args and args[0] == "reset":
+            stats.reset()
+            print("\nStatistics cleared.")
+
+        elif args and args[0] == "json":
+            import json
+            text = json.dumps(summary, indent=2)
+            if len(args) > 1:
+                with open(args[1], "w", encoding="utf-8") as file:
+                    file.write(text)
+                print(f"\nSaved statistics to {args[1]}")
+            else:
+                print(text)
+
+        elif args:
+            raise ValueError("Invalid parameter. Try again.")
+
+        elif not summary:
+            print("\nNo statistics yet.")
+
+        else:
+            headers = ["Operation", "Count", "p50 ms", "p95 ms", "Max ms", "Total ms", "Rows read", "Rows written", "Bytes"]
+            table_data = [[operation["name"], operation["count"], operation["p50"] * 1000, operation["p95"] * 1000, operation["max"] * 1000,
+                           operation["total"] * 1000, operation["rows_read"], operation["rows_written"], operation["bytes"]] for operation in summary]
+            table = tabulate(table_data, headers=headers, tablefmt="heavy_outline", floatfmt=".2f")
+            print(table)
+
+        if not args and registry.databases:
+            caches = [(db.nameDB, db.results.summary()) for db in registry.databases.values()]
+            table_data = [[nameDB, cache["hits"], cache["misses"], cache["evictions"], cache["entries"], format_size(cache["bytes"])] for nameDB, cache in caches]
+            table = tabulate(table_data, headers=["Result cache", "Hits", "Misses", "Evictions", "Entries", "Size"], tablefmt="heavy_outline")
+            print(f"\n{table}")
+
+    except Exception as e:
+        logging.error(f"Error: {str(e)}")
+        print(f"\nError: {str(e)}")
+
+def command_fanout(command: str):
+    # fanout starts worker processes, so it is only imported when used
+    import fanout
+
+    results = None
+    try:
+        args = shlex.split(command)[1:]
+        pattern = ask(args, "\nDatabases (pattern, e.g. shard_*) [*]: ", "*") or "*"
+        if pattern == "cancel":
+            print("\nOk. Canceled.")
+            return
+        source = ask(args, "\nSELECT query or get tables|columns|count|data <table>: ").strip()
+        if source == "cancel":
+            print("\nOk. Canceled.")
+            return
+
+        if source.lower() == "get" or source.lower().startswith("get "):
+            words = shlex.split(source)[1:] or [ask(args, "\nOperation (tables, columns, count, data): ")]
+            table = None
+            if words[0] != "tables":
+                table = words[1] if len(words) > 1 else ask(args, "\nTable name: ")
+            sql, params = fanout.get_query(words[0], table)
+        else:
+            sql, params = source, ()
+            if StatementCache().get(sql).writes:
+                raise ValueError("fanout only runs read-only queries.")
+
+        merge = None
+        if args and args[0] == "merge":
+            if len(args) < 2:
+                raise ValueError(f"merge requires one function per column: {', '.join(fanout.MERGE_FUNCTIONS)}")
+            merge = args[1].split(",")
+
+        names = fanout.match_files(catalog.names(), pattern)
+        if not names:
+            print(f"\nNo databases match {pattern}.")
+            return
+
+        errors = []
+        start = time.perf_counter()
+        results = fanout.run(catalog.directory, names, sql, params)
+        first = None
+        for name, headers, rows, error in results:
+            if error is None:
+                first = (name, headers, rows, error)
+                break
+            errors.append((name, error))
+
+        def merged_rows():
+            for name, headers, rows, error in itertools.chain([first], results):
+                if error is not None:
+                    errors.append((name, error))
+                    continue
+                for row in rows:
+                    yield (name, *row)
+
+        if first is None:
+            print("\nNo results.")
+        elif merge is not None:
+            rows = fanout.merge_rows((row[1:] for row in merged_rows()), merge)
+            render.render(first[1], rows, output)
+        else:
+            render.render(["database", *first[1]], merged_rows(), output)
+
+        for name, error in errors:
+            print(f"\nSkipped {name}: {error}")
+        logging.info(f"Ran on {len(names)} databases in {time.perf_counter() - start:.2f} s: {sql}")
+        if output == "table":
+            print(f"\nDatabases: {len(names) - len(errors)} of {len(names)}")
+
+    except Exception as e:
+        logging.error(f"Error: {str(e)}")
+        print(f"\nError: {str(e)}")
+    finally:
+        if results is not None:
+            results.close()
+
+def command_describe(db: Database, command: str):
+    if db is None:
+        logging.info(f"No database selected.")
+        print("\nNo database selected.")
+
+    else:
+        try:
+            args = shlex.split(command)[1:]
+            hint(args, "\nTables:", ", ".join(t[0] for t in db.get_all_tables()))
+            table = ask(args, "\nTable name: ")
+            if table == "cancel":
+                print("\nOk. Canceled.")
+                return
+            sample = None
+            if args and args[0] == "sample":
+                if len(args) < 2 or not args[1].isdigit():
+                    raise ValueError("Enter the sample percent, for example: describe users sample 10")
+                sample = int(args[1])
+
+            start = time.perf_counter()
+            rows, profiles = db.describe(table, sample)
+            elapsed = time.perf_counter() - start
+        except Exception as e:
+            logging.error(f"Error: {str(e)}")
+            print(f"\nError: {str(e)}")
+        else:
+            def top(profile):
+                prefix = "" if profile["counted"] else "~"
+                return ", ".join(f"{render.to_cell(value)} ({prefix}{count})" for value, count in profile["top"])
+
+            headers = ["Column", "Type", "Nulls", "Distinct", "Min", "Max", "Mean", "Top values"]
+            table_data = [(profile["column"], profile["type"], profile["nulls"], ("" if profile["exact"] else "~") + str(profile["distinct"]),
+                           profile["min"], profile["max"], round(profile["mean"], 4) if profile["mean"] is not None else None, top(profile))
+                          for profile in profiles]
+            if output == "table":
+                sampled = bool(profiles) and profiles[0]["sampled"]
+                print(f"\nTable: {table} | Rows: {'~' if sampled else ''}{rows}" + (f" | Estimated from a {sample}% sample" if sampled else ""))
+            render.render(headers, table_data, output)
+            print(f"\nTime: {elapsed * 1000:.2f} ms")
+
+def command_search(db: Database, command: str):
+    if db is None:
+        logging.info(f"No database selected.")
+        print("\nNo database selected.")
+
+    else:
+        try:
+            args = shlex.split(command)[1:]
+            indexes = db.get_fts()
+            hint(args, "\nTables with full-text index:", ", ".join(index[0] for index in indexes) or "none")
+            table = ask(args, "\nTable name: ")
+            if table == "cancel":
+                print("\nOk. Canceled.")
+                return
+            text = " ".join(args) if args else ask(args, "\nSearch: ")
+            if text == "cancel":
+                print("\nOk. Canceled.")
+                return
+
+            start = time.perf_counter()
+            pager = CursorPager(db.search(table, text))
+            rows = pager.first()
+            elapsed = time.perf_counter() - start
+        except Exception as e:
+            logging.error(f"Error: {str(e)}")
+            print(f"\nError: {str(e)}")
+        else:
+            logging.info(f"Searched {table} for {text} in {elapsed * 1000:.2f} ms")
+            if not rows:
+                print("\nNo matches." + (" Search at least 3 characters." if len(text) < 3 else ""))
+            else:
+                show_pages(pager, f"Search: {text}")
+            print(f"\nTime: {elapsed * 1000:.2f} ms")
+
+def command_output(command: str):
+    args = shlex.split(command)[1:]
+    global output
+    if not args:
+        print(f"\nOutput format: {output}")
+    elif args[0] in render.FORMATS:
+        output = args[0]
+        render.rows_only(output == "tsv")
+        print(f"\nSuccessful! Output format: {output}")
+    else:
+        print(f"\nInvalid format. Available formats: {', '.join(render.FORMATS)}")
+
+def command_profile(db: Database, command: str):
+    if db is None:
+        logging.info(f"No database selected.")
+        print("\nNo database selected.")
+
+    else:
+        try:
+            args = shlex.split(command)[1:]
+            if args:
+                registry.set_profile(db, args[0])
+                logging.info(f"Profile {args[0]} applied to Database: {db.nameDB}")
+                print(f"\nSuccessful! Profile: {args[0]}")
+
+            pragmas = db.get_pragmas()
+            print(f"\nDatabase: {db.nameDB}\nProfile: {db.profile}")
+            table_data = [[pragma, value, *[PROFILES[profile][pragma] for profile in PROFILES]] for pragma, value in pragmas.items()]
+            table = tabulate(table_data, headers=["Setting", "Current", *PROFILES], tablefmt="heavy_outline")
+            print(table)
+
         except Exception as e:
             logging.error(f"Error: {str(e)}")
             print(f"\nError: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,80 @@
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+
+LOG_FILE = "logs/program_logs.log"
+LOG_FORMAT = "%(levelname)s -> %(asctime)s: %(message)s"
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 3
+
+listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats log records as one JSON object per line.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        # Only structured logs need json, so it is not imported at startup
+        import json
+        data = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False)
+
+
+def setup_logging(level: str = "INFO", path: str = LOG_FILE, structured: bool = False,
+                  max_bytes: int = LOG_MAX_BYTES, backup_count: int = LOG_BACKUP_COUNT):
+    """
+    Sends all log records through a queue to a background thread that writes them to a
+    rotating log file, so logging never blocks the command loop on file I/O.
+
+    Args:
+        level (str): The minimum level of logged records, e.g. DEBUG, INFO or ERROR.
+        path (str): The path to the log file.
+        structured (bool): Whether to write the records as JSON lines.
+        max_bytes (int): The size at which the log file is rotated.
+        backup_count (int): The number of rotated log files kept.
+    """
+    global listener
+    stop_logging()
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    file_handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True)
+    file_handler.setFormatter(JsonFormatter() if structured else logging.Formatter(LOG_FORMAT))
+
+    records = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(records))
+    root.setLevel(level.upper())
+
+    listener = logging.handlers.QueueListener(records, file_handler)
+    listener.start()
+
+
+def stop_logging():
+    """
+    Writes the queued records and stops the background thread.
+    """
+    global listener
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+        listener = None
+
+
+atexit.register(stop_logging)
@@ -1,115 +1,286 @@
-from classes import Database
+from classes import PROFILES, Database, stats
 import os
-from tabulate import tabulate
-import logging 
+import sys
+import time
+import argparse
+import logging
 import function
-from art import tprint
+import logger
+import render
 
-if not os.path.exists("files"):
-    os.mkdir("files")
+commands = ["edit", "rename", "create", "get", "del", "help", "select ", "showdbs", "delete_db", "create_db", "sql", "query", "import", "export", "begin", "commit", "rollback", "stats", "profile", "output", "fanout", "search", "describe", "backup_db", "restore_db", "clear", "exit"]
 
-logging.basicConfig(filename='logs/program_logs.log', filemode='a', format='%(levelname)s -> %(asctime)s: %(message)s', level=logging.DEBUG)
-os.system('cls' if os.name == 'nt' else 'clear')
-tprint("SQL-Viewer")
+# Scripts that manage transactions themselves are not wrapped in one
+transaction_commands = ("begin", "commit", "rollback", "savepoint ", "release ")
 
-print("\nWelcome to SQL-Viewer!\n\nFor help type 'help'")
+def clear_screen():
+    # ANSI escape codes clear the terminal without starting a shell
+    print("\033[2J\033[3J\033[H", end="", flush=True)
 
-db = None
+def show_banner():
+    # art is only imported when the banner is shown, so --quiet and scripts don't load it
+    from art import tprint
 
-commands = ["edit", "rename", "create", "get", "del", "help", "select ", "showdbs", "delete_db", "create_db", "clear", "exit"]
+    clear_screen()
+    tprint("SQL-Viewer")
+    print("\nWelcome to SQL-Viewer!\n\nFor help type 'help'")
 
-while True:
+def show_goodbye():
+    from art import tprint
 
-    databases = []
-    for f in os.listdir("files"):
-        if f.endswith('.db'):
-            databases.append(f)
-    formatted_databases = ', '.join(databases)
+    clear_screen()
+    logging.debug("Goodbye!")
+    tprint("\nGoodbye!")
 
+def command_name(command: str) -> str:
+    """
+    Returns the name a command is recorded under in stats, e.g. "get data".
+    """
+    words = command.lower().split()
+    if len(words) > 1 and words[0] in ["get", "del", "create", "rename", "edit"]:
+        return " ".join(words[:2])
+    return words[0] if words else ""
+
+def run_command(db: Database, command: str):
+    """
+    Runs one command and returns the database selected after it.
+    The time the command takes is recorded in stats.
+    """
+    start = time.perf_counter()
     try:
-        
-        if db is not None:
-            command = input(f"\n{db.nameDB} >>> ")
-        else:
-            command = input("\n>>> ")
+        return dispatch_command(db, command)
+    finally:
+        stats.record(f"command: {command_name(command)}", time.perf_counter() - start)
+
+def dispatch_command(db: Database, command: str):
+    if not function.is_valid_command(command, commands):
+        print("Command not found! or wrong command. Try again.")
+
+    name = command.lower().split()[0] if command.strip() else ""
+
+    if command.lower() == "help":
+        function.show_help()
+
+    elif command.lower() == "get":
+        print("\nThis command requires argument.\nFor help type 'help'")
+
+    elif command.lower() == "del":
+        print("\nThis command requires argument.\nFor help type 'help'")
+
+    elif command.lower() == "create":
+        print("\nThis command requires argument.\nFor help type 'help'")
+
+    elif command.lower() == "rename":
+        print("\nThis command requires argument.\nFor help type 'help'")
+
+    elif command.lower() == "edit":
+        print("\nThis command requires argument.\nFor help type 'help'")
+
+    elif command.lower() == "clear":
+        if not function.batch:
+            show_banner()
+
+    elif name == "profile":
+        function.command_profile(db, command)
 
-        if not function.is_valid_command(command, commands):
-            print("Command not found! or wrong command. Try again.")
+    elif name == "describe":
+        function.command_describe(db, command)
 
-        if command.lower() == "help":
-            function.show_help()
+    elif name == "backup_db":
+        function.command_backup(db, command)
 
-        elif command.lower() == "get":
-            print("\nThis command requires argument.\nFor help type 'help'")
+    elif name == "restore_db":
+        function.command_restore(db, command)
 
-        elif command.lower() == "del":
-            print("\nThis command requires argument.\nFor help type 'help'")
+    elif name == "search":
+        function.command_search(db, command)
 
-        elif command.lower() == "create":
-            print("\nThis command requires argument.\nFor help type 'help'")
+    elif name == "fanout":
+        function.command_fanout(command)
 
-        elif command.lower() == "rename":
-            print("\nThis command requires argument.\nFor help type 'help'")
+    elif name == "output":
+        function.command_output(command)
 
-        elif command.lower() == "edit":
-            print("\nThis command requires argument.\nFor help type 'help'")
+    elif name == "stats":
+        function.command_stats(command)
 
-        elif command.lower() == "clear":
-            os.system('cls' if os.name == 'nt' else 'clear')
-            tprint("SQL-Viewer")
-            print("\nWelcome to SQL-Viewer!\n\nFor help type 'help'")
-        
-        elif "select " in command.lower():
+    elif name in ["sql", "query"]:
+        function.command_sql(db, command)
+
+    elif command.lower().startswith("select "):
+        if db is not None and db.session:
+            print("\nTransaction is open. Run `commit` or `rollback` first.")
+        else:
             db = function.select_command(command)
 
-        elif "get " in command.lower():
-            function.command_get(db, command)
-
-        elif "del " in command.lower():
-            function.command_del(db, command)
-
-        elif "create " in command.lower():
-            function.command_create(db, command)
-                
-        elif "rename " in command.lower():
-            function.command_rename(db, command)
-          
-        elif "edit " in command.lower():
-            function.command_edit(db, command)
-                
-        elif command.lower() == "showdbs":
-            function.command_showdbs(databases, formatted_databases)
-                
-        elif command.lower() == "delete_db":
-            name = input("Enter database name: ")
+    elif name in ["attach", "detach"]:
+        function.command_attach(db, command)
+
+    elif name == "import":
+        function.command_import(db, command)
+
+    elif name == "export":
+        function.command_export(db, command)
+
+    elif command.lower() in ["begin", "commit", "rollback"] or command.lower().startswith(("savepoint ", "release ", "rollback to ")):
+        function.command_transaction(db, command)
+
+    elif name == "get":
+        function.command_get(db, command)
+
+    elif name == "del":
+        function.command_del(db, command)
+
+    elif name == "create":
+        function.command_create(db, command)
+
+    elif name == "rename":
+        function.command_rename(db, command)
+
+    elif name == "edit":
+        function.command_edit(db, command)
+
+    elif command.lower() == "showdbs":
+        function.command_showdbs()
+
+    elif name == "delete_db":
+        name = function.ask(command.split()[1:], "Enter database name: ")
+        if name == "cancel":
+            print("\nOk. Canceled.")
+        else:
+            function.delete_database(db, name)
+
+    elif name == "create_db":
+        if db is None:
+            name = function.ask(command.split()[1:], "Enter database name: ")
             if name == "cancel":
                 print("\nOk. Canceled.")
             else:
-                function.delete_database(db, name)
-
-        elif command.lower() == "create_db":
-            if db is None:
-                name = input("Enter database name: ")
-                if name == "cancel":
-                    print("\nOk. Canceled.")
-                else:
-                    function.create_database(name)
+                function.create_database(name)
+        else:
+            logging.info(f"User try to create database, but he selected another database.")
+            print("You already have a database. Plese run `select cancel` to exit from selected database.")
+
+    return db
+
+def run_script(db: Database, path: str):
+    """
+    Runs the commands of a script file one after another without prompts.
+
+    Unless the script manages transactions itself, its commands are grouped into one
+    transaction per selected database.
+    """
+    with open(path, encoding="utf-8") as file:
+        manual = any(line.strip().lower().startswith(transaction_commands) for line in file)
+
+    if not manual and db is not None and not db.session:
+        db.begin()
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            command = line.strip()
+            if not command or command.startswith("#"):
+                continue
+            if command.lower() == "exit":
+                break
+
+            if not manual and db is not None and db.session and command.lower().startswith(("select ", "attach ", "detach ", "profile ", "backup_db", "restore_db")):
+                db.commit()
+            try:
+                db = run_command(db, command)
+            except Exception as e:
+                logging.error(f"Error: {str(e)}")
+                print(f"\nError: {str(e)}")
+            if not manual and db is not None and not db.session:
+                db.begin()
+
+    if not manual and db is not None and db.session:
+        db.commit()
+    return db
+
+def main():
+    parser = argparse.ArgumentParser(description="SQL-Viewer")
+    parser.add_argument("--db", help="database in files/ to select on start")
+    parser.add_argument("--profile", choices=list(PROFILES), help="performance profile for the --db database")
+    parser.add_argument("--script", help="run the commands of a file without prompts and exit")
+    parser.add_argument("--output", default="table", choices=render.FORMATS, help="print rows as a table or as tab-separated values (default: table)")
+    parser.add_argument("--quiet", action="store_true", help="start without the banner and screen clearing")
+    parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"], help="minimum level written to the log (default: INFO)")
+    parser.add_argument("--log-file", default=logger.LOG_FILE, help=f"log file, rotated at {logger.LOG_MAX_BYTES // (1024 * 1024)} MB (default: {logger.LOG_FILE})")
+    parser.add_argument("--log-json", action="store_true", help="write log records as JSON lines")
+    options = parser.parse_args()
+
+    if not os.path.exists("files"):
+        os.mkdir("files")
+
+    logger.setup_logging(options.log_level, options.log_file, options.log_json)
+    function.output = options.output
+    render.rows_only(options.output == "tsv")
+
+    db = None
+
+    if options.script:
+        function.batch = True
+        try:
+            if options.db:
+                name = options.db if ".db" in options.db else options.db + ".db"
+                db = function.registry.get(name, create=True)
+                if options.profile:
+                    function.registry.set_profile(db, options.profile)
+            run_script(db, options.script)
+        except KeyboardInterrupt:
+            print("\nInterrupted.")
+        except BrokenPipeError:
+            # The reader of the output, e.g. head, exited. Remaining output is discarded.
+            os.dup2(os.open(os.devnull, os.O_WRONLY), (render.stdout or sys.stdout).fileno())
+        finally:
+            function.registry.close_all()
+        return
+
+    if not options.quiet:
+        show_banner()
+
+    if options.db:
+        db = function.select_command(f"select {options.db}")
+        if db is not None and options.profile:
+            function.command_profile(db, f"profile {options.profile}")
+
+    while True:
+
+        try:
+
+            if db is not None and db.session:
+                command = input(f"\n{db.nameDB}* >>> ")
+            elif db is not None:
+                command = input(f"\n{db.nameDB} >>> ")
             else:
-                logging.info(f"User try to create database, but he selected another database.")
-                print("You already have a database. Plese run `select cancel` to exit from selected database.")
+                command = input("\n>>> ")
 
-        elif command.lower() == "exit":
-            os.system('cls' if os.name == 'nt' else 'clear')
-            logging.debug("Goodbye!")
-            tprint("\nGoodbye!")
-            break
+            if command.lower() == "exit":
+                if db is not None and db.session:
+                    answer = input("Transaction is open. Commit changes? (y/n): ")
+                    if answer.lower() in ["y", "yes"]:
+                        db.commit()
+                function.registry.close_all()
+                if not options.quiet:
+                    show_goodbye()
+                break
+
+            try:
+                db = run_command(db, command)
+            except KeyboardInterrupt:
+                # Ctrl+C during a command cancels only the command
+                logging.info(f"Canceled: {command}")
+                print("\nOk. Canceled.")
+
+        except Exception as e:
+            logging.error(f"Error: {str(e)}")
+            print(f"\nError: {str(e)}")
 
-    except Exception as e:
-        logging.error(f"Error: {str(e)}")
-        print(f"\nError: {str(e)}")
+        except KeyboardInterrupt:
+            function.registry.close_all()
+            if not options.quiet:
+                show_goodbye()
+            break
 
-    except KeyboardInterrupt:
-        os.system('cls' if os.name == 'nt' else 'clear')
-        logging.debug("Goodbye!")
-        tprint("\nGoodbye!")
-        break
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+import itertools
+import sys
+
+SAMPLE_SIZE = 1000
+MAX_WIDTH = 40
+FORMATS = ["table", "tsv"]
+# Where rows are printed while all other output goes to stderr, see rows_only
+stdout = None
+
+
+def to_cell(value, missing: str = "") -> str:
+    """
+    Converts a value to the text of one cell on a single line.
+    """
+    if value is None:
+        return missing
+    text = str(value)
+    if "\n" in text or "\t" in text or "\r" in text:
+        text = text.replace("\r", " ").replace("\n", " ").replace("\t", " ")
+    return text
+
+
+def truncate(text: str, width: int) -> str:
+    """
+    Shortens a text to `width` characters, marking the cut with an ellipsis.
+    """
+    return text if len(text) <= width else text[:width - 1] + "…"
+
+
+def render_table(headers: list, rows, out=None, sample: int = SAMPLE_SIZE, max_width: int = MAX_WIDTH, missing: str = ""):
+    """
+    Prints rows as a table while they are read from an iterator.
+
+    Column widths and alignment are worked out from the first `sample` rows, so only those
+    rows are held in memory. Longer cells, and cells of later rows that don't fit, are
+    truncated to the column width.
+
+    Args:
+        headers (list): The column names.
+        rows (iterable): The rows, e.g. a cursor.
+        out (file): Where to print. Defaults to sys.stdout.
+        sample (int): The number of rows used to work out the column widths.
+        max_width (int): The maximum width of a column.
+        missing (str): The text shown for NULL.
+
+    Returns:
+        int: The number of printed rows.
+    """
+    out = out or stdout or sys.stdout
+    rows = iter(rows)
+    first = list(itertools.islice(rows, sample))
+    headers = [truncate(to_cell(header), max_width) for header in headers]
+    if not headers and first:
+        headers = [""] * len(first[0])
+
+    # A column is right-aligned if its sampled values are all numbers
+    numeric = [None] * len(headers)
+    widths = [min(len(header) + 2, max_width) for header in headers]
+    for row in first:
+        for index, value in enumerate(row):
+            if value is not None:
+                number = isinstance(value, (int, float)) and not isinstance(value, bool)
+                numeric[index] = number if numeric[index] is None else numeric[index] and number
+            widths[index] = max(widths[index], min(len(to_cell(value, missing)), max_width))
+
+    def line(left: str, middle: str, right: str) -> str:
+        return left + middle.join("━" * (width + 2) for width in widths) + right + "\n"
+
+    justify = [str.rjust if right else str.ljust for right in numeric]
+
+    def cells(values: list) -> str:
+        return "┃ " + " ┃ ".join([pad(text if len(text) <= width else text[:width - 1] + "…", width)
+                                  for text, width, pad in zip(values, widths, justify)]) + " ┃\n"
+
+    # Rows without NULLs whose cells fit on one line are formatted in one step, the others cell by cell
+    template = "┃ " + " ┃ ".join(f"%{'' if right else '-'}{width}s" for width, right in zip(widths, numeric)) + " ┃\n"
+    length = len(template % tuple([""] * len(widths)))
+
+    out.write(line("┏", "┳", "┓"))
+    out.write(cells(headers))
+    out.write(line("┣", "╋", "┫"))
+    count = 0
+    for row in itertools.chain(first, rows):
+        text = None
+        if None not in row:
+            try:
+                text = template % tuple(row)
+            except TypeError:
+                pass
+        if text is None or len(text) != length or text.count("\n") != 1 or "\r" in text or "\t" in text:
+            text = cells([missing if value is None else str(value) for value in row])
+            if text.count("\n") != 1 or "\r" in text or "\t" in text:
+                text = cells([to_cell(value, missing) for value in row])
+        out.write(text)
+        count += 1
+    out.write(line("┗", "┻", "┛"))
+    out.flush()
+    return count
+
+
+def render_tsv(headers: list, rows, out=None, missing: str = ""):
+    """
+    Prints rows as tab-separated values, one line per row, for piping into other tools.
+    Tabs and line breaks inside values are replaced by spaces.
+
+    Returns:
+        int: The number of printed rows.
+    """
+    out = out or stdout or sys.stdout
+    out.write("\t".join(to_cell(header) for header in headers) + "\n")
+    count = 0
+    for row in rows:
+        out.write("\t".join([to_cell(value, missing) for value in row]) + "\n")
+        count += 1
+    out.flush()
+    return count
+
+
+def rows_only(enabled: bool):
+    """
+    Sends everything printed except rows to stderr, so that stdout can be piped into other tools.
+
+    Args:
+        enabled (bool): Whether only rows go to stdout.
+    """
+    global stdout
+    if enabled and stdout is None:
+        stdout = sys.stdout
+        sys.stdout = sys.stderr
+    elif not enabled and stdout is not None:
+        sys.stdout = stdout
+        stdout = None
+
+
+def render(headers: list, rows, format: str = "table", out=None, missing: str = ""):
+    """
+    Prints rows as a table or as tab-separated values.
+
+    Args:
+        headers (list): The column names.
+        rows (iterable): The rows.
+        format (str): "table" or "tsv".
+        out (file): Where to print. Defaults to stdout, even while rows_only is enabled.
+        missing (str): The text shown for NULL.
+
+    Returns:
+        int: The number of printed rows.
+    """
+    if format == "tsv":
+        return render_tsv(headers, rows, out, missing)
+    return render_table(headers, rows, out, missing=missing)
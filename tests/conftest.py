@@ -0,0 +1,30 @@
+import os
+import sqlite3
+import sys
+
+import pytest
+
+# The modules live next to main.py, not in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from classes import Database  # noqa: E402
+
+
+@pytest.fixture
+def open_db(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "files").mkdir()
+    databases = []
+
+    def open_db(*statements):
+        conn = sqlite3.connect(tmp_path / "files" / "test.db")
+        for statement in statements:
+            conn.execute(statement)
+        conn.commit()
+        conn.close()
+        databases.append(Database("test.db", create=False))
+        return databases[-1]
+
+    yield open_db
+    for db in databases:
+        db.close()
@@ -0,0 +1,39 @@
+import function
+
+
+class FakeDatabase:
+    def __init__(self, path):
+        self.path = path
+        self.calls = []
+
+    def suggest_index(self, table, column, action):
+        self.calls.append((table, column))
+        return f'CREATE INDEX "idx_{table}_{column}" ON "{table}" ("{column}");'
+
+
+def test_batch_mode_checks_every_column_once(monkeypatch, capsys):
+    monkeypatch.setattr(function, "batch", True)
+    monkeypatch.setattr(function, "advised", set())
+    first, second = FakeDatabase("first.db"), FakeDatabase("second.db")
+
+    for _ in range(3):
+        function.advise_index(first, "users", "name", "del")
+        function.advise_index(first, "users", "name", "edit")
+    function.advise_index(first, "users", "age", "del")
+    function.advise_index(second, "users", "name", "del")
+
+    assert first.calls == [("users", "name"), ("users", "age")]
+    assert second.calls == [("users", "name")]
+    assert capsys.readouterr().out.count("Suggested:") == 3
+
+
+def test_interactive_mode_checks_every_lookup(monkeypatch):
+    monkeypatch.setattr(function, "batch", False)
+    monkeypatch.setattr(function, "advised", set())
+    monkeypatch.setattr("builtins.input", lambda prompt: "n")
+    db = FakeDatabase("first.db")
+
+    function.advise_index(db, "users", "name", "del")
+    function.advise_index(db, "users", "name", "del")
+
+    assert db.calls == [("users", "name"), ("users", "name")]
@@ -0,0 +1,52 @@
+from classes import definition_column, references, replace_type, split_definitions
+
+
+def test_split_definitions_keeps_nested_commas():
+    head, definitions, tail = split_definitions('CREATE TABLE "t" (id INTEGER PRIMARY KEY, price DECIMAL(10, 2) NOT NULL, CHECK (price > 0)) STRICT')
+    assert head == 'CREATE TABLE "t" ('
+    assert definitions == ["id INTEGER PRIMARY KEY", "price DECIMAL(10, 2) NOT NULL", "CHECK (price > 0)"]
+    assert tail == ") STRICT"
+
+
+def test_split_definitions_ignores_quoted_commas_and_parentheses():
+    sql = """CREATE TABLE t ("a, b" TEXT, [c)] INT DEFAULT ',', `d` -- note, (
+    )"""
+    _, definitions, _ = split_definitions(sql)
+    assert definitions == ['"a, b" TEXT', "[c)] INT DEFAULT ','", "`d` -- note, ("]
+
+
+def test_definition_column_unquotes_names():
+    assert definition_column('"first name" TEXT') == "first name"
+    assert definition_column('"say ""hi""" TEXT') == 'say "hi"'
+    assert definition_column("[order] INT") == "order"
+    assert definition_column("`group`") == "group"
+    assert definition_column("age") == "age"
+
+
+def test_definition_column_skips_table_constraints():
+    assert definition_column("PRIMARY KEY (a, b)") is None
+    assert definition_column("CONSTRAINT fk FOREIGN KEY (a) REFERENCES p (id)") is None
+    assert definition_column("UNIQUE (a)") is None
+
+
+def test_replace_type_of_column_without_type():
+    assert replace_type("age", "INTEGER") == "age INTEGER"
+    assert replace_type('"first name" NOT NULL', "TEXT") == '"first name" TEXT NOT NULL'
+
+
+def test_replace_type_with_size():
+    assert replace_type("price DECIMAL(10, 2)", "REAL") == "price REAL"
+    assert replace_type("price DECIMAL(10, 2) NOT NULL DEFAULT 0", "TEXT") == "price TEXT NOT NULL DEFAULT 0"
+
+
+def test_replace_type_keeps_constraints():
+    assert replace_type("id INTEGER PRIMARY KEY AUTOINCREMENT", "INT") == "id INT PRIMARY KEY AUTOINCREMENT"
+    assert replace_type("age UNSIGNED BIG INT CHECK (age > 0) COLLATE NOCASE", "TEXT") == "age TEXT CHECK (age > 0) COLLATE NOCASE"
+    assert replace_type("p INT REFERENCES parent (id)", "TEXT") == "p TEXT REFERENCES parent (id)"
+
+
+def test_references_matches_names_not_strings():
+    assert references("CREATE TRIGGER t AFTER INSERT ON log BEGIN INSERT INTO parent VALUES (1); END", "parent")
+    assert references('CREATE TRIGGER t AFTER INSERT ON log BEGIN DELETE FROM "Parent"; END', "parent")
+    assert not references("CREATE TRIGGER t AFTER INSERT ON log BEGIN SELECT 'parent'; END", "parent")
+    assert not references("CREATE TRIGGER t AFTER INSERT ON log BEGIN INSERT INTO parents VALUES (1); END", "parent")
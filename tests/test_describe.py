@@ -0,0 +1,42 @@
+import pytest
+
+
+@pytest.mark.parametrize("sample", [None, 10])
+def test_describe_empty_table(open_db, sample):
+    db = open_db("CREATE TABLE t (id INTEGER PRIMARY KEY, name TEXT)")
+    rows, profiles = db.describe("t", sample)
+    assert rows == 0
+    assert [(profile["column"], profile["nulls"], profile["distinct"], profile["exact"], profile["top"]) for profile in profiles] == [
+        ("id", 0, 0, True, []), ("name", 0, 0, True, [])]
+
+
+def test_describe_counts_values(open_db):
+    db = open_db("CREATE TABLE t (id INTEGER PRIMARY KEY, city TEXT)",
+                 "INSERT INTO t (city) VALUES ('a'), ('a'), ('b'), (NULL)")
+    rows, profiles = db.describe("t")
+    assert rows == 4
+    city = profiles[1]
+    assert (city["nulls"], city["distinct"], city["exact"], city["min"], city["max"]) == (1, 2, True, "a", "b")
+    assert city["top"] == [["a", 2]]
+
+
+@pytest.mark.parametrize("rows", [0, 60])
+def test_describe_samples_small_without_rowid_table_in_full(open_db, rows):
+    values = ", ".join(f"({index}, 'v{index % 3}')" for index in range(rows))
+    db = open_db("CREATE TABLE wr (k INTEGER PRIMARY KEY, v TEXT) WITHOUT ROWID",
+                 *([f"INSERT INTO wr VALUES {values}"] if rows else []))
+    for _ in range(20):
+        db.clear_schema_cache()
+        count, profiles = db.describe("wr", 1)
+        assert count == rows
+        assert [(profile["distinct"], profile["sampled"]) for profile in profiles] == [(rows, False), (min(rows, 3), False)]
+
+
+def test_describe_distinct_is_capped_and_exact_below_the_sketch_size(open_db):
+    db = open_db("CREATE TABLE t (id INTEGER PRIMARY KEY, unique_value INT, few INT)",
+                 "WITH RECURSIVE n(value) AS (SELECT 0 UNION ALL SELECT value + 1 FROM n WHERE value < 4999) "
+                 "INSERT INTO t (unique_value, few) SELECT value, value % 500 FROM n")
+    _, profiles = db.describe("t")
+    unique_value, few = profiles[1], profiles[2]
+    assert unique_value["distinct"] <= 5000 and not unique_value["exact"]
+    assert (few["distinct"], few["exact"]) == (500, True)
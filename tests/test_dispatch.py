@@ -0,0 +1,29 @@
+import pytest
+
+import function
+import main
+
+HANDLERS = ["command_get", "command_del", "command_create", "command_rename", "command_edit", "command_export", "select_command"]
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = []
+    for handler in HANDLERS:
+        monkeypatch.setattr(function, handler, lambda *args, handler=handler: calls.append(handler))
+    return calls
+
+
+@pytest.mark.parametrize("command, handler", [
+    ('edit record users name "model del" renamed', "command_edit"),
+    ('edit record users name budget "get more"', "command_edit"),
+    ('del record users name "create table"', "command_del"),
+    ('create record users "rename me" 30', "command_create"),
+    ('rename column users "edit date" edited', "command_rename"),
+    ('get data "select "', "command_get"),
+    ('export "SELECT * FROM users" out.csv', "command_export"),
+    ("select shop", "select_command"),
+])
+def test_command_is_routed_by_its_first_word(calls, command, handler):
+    main.dispatch_command(None, command)
+    assert calls == [handler]
@@ -0,0 +1,33 @@
+def names(db, sql):
+    return sorted(row[0] for row in db.conn.execute(sql))
+
+
+def test_rename_table_moves_the_full_text_index(open_db):
+    db = open_db("CREATE TABLE notes (title TEXT, body TEXT)",
+                 "INSERT INTO notes VALUES ('first', 'hello world'), ('second', 'goodbye world')")
+    db.create_fts("notes", ["body"], "unicode61")
+
+    db.rename_table("notes", "memos")
+
+    assert db.get_fts() == [("memos", ["body"])]
+    assert names(db, "SELECT name FROM sqlite_master WHERE type = 'trigger'") == ["memos_fts_delete", "memos_fts_insert", "memos_fts_update"]
+    assert "content='memos'" in db.conn.execute("SELECT sql FROM sqlite_master WHERE name = 'memos_fts'").fetchone()[0]
+    assert "tokenize='unicode61'" in db.conn.execute("SELECT sql FROM sqlite_master WHERE name = 'memos_fts'").fetchone()[0]
+    assert not names(db, "SELECT name FROM sqlite_master WHERE name LIKE 'notes%'")
+
+    assert sorted(row[3] for row in db.search("memos", "world")) == ["goodbye world", "hello world"]
+    db.conn.execute("INSERT INTO memos VALUES ('third', 'hello again')")
+    db.conn.execute("UPDATE memos SET body = 'farewell' WHERE title = 'first'")
+    db.conn.execute("DELETE FROM memos WHERE title = 'second'")
+    assert [row[3] for row in db.search("memos", "hello")] == ["hello again"]
+    assert [row[3] for row in db.search("memos", "farewell")] == ["farewell"]
+    assert list(db.search("memos", "goodbye")) == []
+
+
+def test_rename_table_without_full_text_index(open_db):
+    db = open_db("CREATE TABLE notes (body TEXT)", "INSERT INTO notes VALUES ('hello')")
+
+    db.rename_table("notes", "memos")
+
+    assert db.get_fts() == []
+    assert db.conn.execute("SELECT body FROM memos").fetchall() == [("hello",)]
@@ -0,0 +1,41 @@
+import pytest
+
+from classes import quote
+
+TABLE = 'it\'s "odd"'
+COLUMN = 'say "hi"'
+
+
+@pytest.mark.parametrize("name, mark, quoted", [
+    ("users", '"', '"users"'),
+    ('say "hi"', '"', '"say ""hi"""'),
+    ("it's", "'", "'it''s'"),
+])
+def test_quote(name, mark, quoted):
+    assert quote(name, mark) == quoted
+
+
+@pytest.fixture
+def odd_db(open_db):
+    return open_db(f"CREATE TABLE {quote(TABLE)} ({quote(COLUMN)} TEXT, n INTEGER)",
+                   f"INSERT INTO {quote(TABLE)} VALUES ('apple pie', 1), ('banana split', 2), ('apple tart', 3)")
+
+
+def test_reads_tables_with_quotes_in_their_names(odd_db):
+    assert odd_db.get_values(TABLE, COLUMN, "apple") == ["apple pie", "apple tart"]
+    assert odd_db.get_cardinality(TABLE, COLUMN) == (3, True)
+    assert [(stats["table"], stats["rows"]) for stats in odd_db.get_table_stats()] == [(TABLE, 3)]
+    assert [profile["distinct"] for profile in odd_db.describe(TABLE)[1]] == [3, 3]
+
+
+def test_full_text_index_on_tables_with_quotes_in_their_names(odd_db):
+    odd_db.create_fts(TABLE, [COLUMN])
+    odd_db.conn.execute(f"INSERT INTO {quote(TABLE)} VALUES ('apple crumble', 4)")
+    assert sorted(row[2] for row in odd_db.search(TABLE, "apple")) == ["apple crumble", "apple pie", "apple tart"]
+
+    odd_db.edit_column_type(TABLE, "n", "TEXT")
+    odd_db.conn.execute(f"DELETE FROM {quote(TABLE)} WHERE n = '1'")
+    assert sorted(row[2] for row in odd_db.search(TABLE, "apple")) == ["apple crumble", "apple tart"]
+
+    odd_db.rename_table(TABLE, "plain")
+    assert odd_db.get_fts() == [("plain", [COLUMN])]
@@ -0,0 +1,22 @@
+import os
+import sqlite3
+
+from classes import ConnectionRegistry
+
+
+def test_registry_reuses_connections_through_symbolic_links(tmp_path, monkeypatch):
+    (tmp_path / "dbs").mkdir()
+    sqlite3.connect(tmp_path / "dbs" / "shop.db").close()
+    os.symlink(tmp_path / "dbs", tmp_path / "files")
+    monkeypatch.chdir(tmp_path)
+
+    registry = ConnectionRegistry()
+    db = registry.get("shop.db", create=False)
+    assert registry.get("shop.db", create=False) is db
+    assert list(registry.databases) == [db.path]
+
+    registry.set_profile(db, "fast-write")
+    registry.close("shop.db")
+    assert not registry.databases
+    assert registry.get("shop.db", create=False).profile == "fast-write"
+    registry.close_all()
@@ -0,0 +1,218 @@
+import csv
+import gzip
+import io
+import json
+import lzma
+import os
+
+BUFFER_SIZE = 1 << 20
+EXPORT_CHUNK_SIZE = 10000
+COMPRESSIONS = {".gz": gzip.GzipFile, ".xz": lzma.LZMAFile}
+
+
+def split_extension(path: str):
+    """
+    Splits a path into its file type and compression extensions, e.g. ("data.csv.gz") -> (".csv", ".gz").
+    """
+    root, extension = os.path.splitext(path.lower())
+    if extension in COMPRESSIONS:
+        return os.path.splitext(root)[1], extension
+    return extension, ""
+
+
+def open_file(path: str, mode: str = "r"):
+    """
+    Opens a text file with a large buffer, compressing or decompressing it by the
+    .gz or .xz extension.
+
+    Args:
+        path (str): The path to the file.
+        mode (str): "r" to read or "w" to write.
+
+    Returns:
+        io.TextIOWrapper: The opened file.
+    """
+    compression = COMPRESSIONS.get(split_extension(path)[1])
+    if compression is None:
+        raw = open(path, mode + "b", buffering=0)
+    else:
+        raw = compression(path, mode + "b")
+    if mode == "r":
+        buffered = io.BufferedReader(raw, BUFFER_SIZE)
+    else:
+        buffered = io.BufferedWriter(raw, BUFFER_SIZE)
+    return io.TextIOWrapper(buffered, encoding="utf-8", newline="")
+
+
+def read_csv(path: str):
+    """
+    Reads a CSV file row by row.
+
+    Args:
+        path (str): The path to the CSV file. The first row must contain the column names.
+
+    Returns:
+        tuple: The column names and an iterator over the rows as tuples.
+    """
+    file = open_file(path)
+    reader = csv.reader(file)
+    try:
+        columns = next(reader)
+    except StopIteration:
+        file.close()
+        return [], iter(())
+
+    def rows():
+        with file:
+            for row in reader:
+                yield tuple(row)
+
+    return columns, rows()
+
+
+def read_jsonl(path: str):
+    """
+    Reads a JSON Lines file object by object.
+
+    The keys of the first object are used as the column names. Missing keys become NULL,
+    nested values are stored as JSON text.
+
+    Args:
+        path (str): The path to the JSON Lines file.
+
+    Returns:
+        tuple: The column names and an iterator over the rows as tuples.
+    """
+    file = open_file(path)
+    lines = (line for line in file if line.strip())
+    try:
+        first = json.loads(next(lines))
+    except StopIteration:
+        file.close()
+        return [], iter(())
+    columns = list(first)
+
+    def to_row(record):
+        values = (record.get(column) for column in columns)
+        return tuple(json.dumps(value) if isinstance(value, (dict, list)) else value for value in values)
+
+    def rows():
+        with file:
+            yield to_row(first)
+            for line in lines:
+                yield to_row(json.loads(line))
+
+    return columns, rows()
+
+
+def read_file(path: str):
+    """
+    Reads a CSV or JSON Lines file, chosen by the file extension. The file may be gzip- or lzma-compressed.
+
+    Args:
+        path (str): The path to the file.
+
+    Returns:
+        tuple: The column names and an iterator over the rows as tuples.
+    """
+    extension = split_extension(path)[0]
+    if extension == ".csv":
+        return read_csv(path)
+    if extension in [".jsonl", ".ndjson"]:
+        return read_jsonl(path)
+    raise ValueError(f"Unsupported file type: {extension}. Use .csv or .jsonl")
+
+
+def to_text(value):
+    """
+    Converts BLOB values to hex text, other values are returned unchanged.
+    """
+    if isinstance(value, bytes):
+        return value.hex()
+    return value
+
+
+def write_file(path: str, headers: list, cursor, progress=None, chunk_size: int = EXPORT_CHUNK_SIZE):
+    """
+    Writes the rows of a cursor to a CSV or JSON Lines file, chosen by the file extension.
+
+    Rows are fetched in chunks, so memory use does not depend on the number of rows.
+    A .gz or .xz extension compresses the file.
+
+    Args:
+        path (str): The path to the file.
+        headers (list): The column names.
+        cursor (sqlite3.Cursor): The executed cursor to read the rows from.
+        progress (callable): Called with the number of written rows after every chunk.
+        chunk_size (int): The number of rows fetched at once.
+
+    Returns:
+        int: The number of written rows.
+    """
+    extension = split_extension(path)[0]
+    if extension not in [".csv", ".jsonl", ".ndjson"]:
+        raise ValueError(f"Unsupported file type: {extension}. Use .csv or .jsonl")
+
+    count = 0
+    with open_file(path, "w") as file:
+        if extension == ".csv":
+            writer = csv.writer(file)
+            writer.writerow(headers)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            if extension == ".csv":
+                writer.writerows([to_text(value) for value in row] for row in rows)
+            else:
+                file.writelines(json.dumps(dict(zip(headers, row)), ensure_ascii=False, default=to_text) + "\n" for row in rows)
+            count += len(rows)
+            if progress:
+                progress(count)
+    return count
+
+
+def chunks(rows, size: int):
+    """
+    Splits an iterator of rows into lists of at most `size` rows.
+    """
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def guess_type(values) -> str:
+    """
+    Guesses the SQLite column type for a sample of values.
+
+    Returns:
+        str: INTEGER, REAL or TEXT.
+    """
+    guess = None
+    for value in values:
+        if value is None or value == "":
+            continue
+        if isinstance(value, bool) or isinstance(value, int):
+            value_type = "INTEGER"
+        elif isinstance(value, float):
+            value_type = "REAL"
+        elif isinstance(value, str):
+            try:
+                int(value)
+                value_type = "INTEGER"
+            except ValueError:
+                try:
+                    float(value)
+                    value_type = "REAL"
+                except ValueError:
+                    return "TEXT"
+        else:
+            return "TEXT"
+        if guess is None or (guess, value_type) == ("INTEGER", "REAL"):
+            guess = value_type
+    return guess or "TEXT"